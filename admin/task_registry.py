@@ -4,6 +4,13 @@ from datetime import datetime
 from datetime import timezone
 from config import TASK_FILE
 from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from utils.excel_handler import read_excel, write_excel
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    fcntl = None
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
@@ -12,6 +19,9 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 REGISTRY_FILE = os.path.join(DATA_DIR, "tasks_registry.xlsx")
 
+# Serializes append_tasks' load -> append -> save of TASK_FILE across processes
+LOCK_FILE = str(TASK_FILE) + ".lock"
+
 COLUMNS = [
     "meeting_id",
     "task_id",
@@ -33,10 +43,10 @@ def init_registry():
 
 def load_registry() -> pd.DataFrame:
     init_registry()
-    return pd.read_excel(REGISTRY_FILE)
+    return read_excel(REGISTRY_FILE)
 
 def save_registry(df: pd.DataFrame):
-    df.to_excel(REGISTRY_FILE, index=False)
+    write_excel(df, REGISTRY_FILE)
 
 def task_exists(df: pd.DataFrame, task_id: str) -> bool:
     return task_id in df["task_id"].astype(str).values
@@ -48,11 +58,16 @@ def add_tasks_from_mom(mom_data: dict):
     df = load_registry()
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
+    # Collect new rows and grow the frame once, instead of a row at a time
+    existing_ids = set(df["task_id"].astype(str))
+    new_rows = []
+
     for task in mom_data["tasks"]:
-        if task_exists(df, task["task_id"]):
+        if str(task["task_id"]) in existing_ids:
             continue
+        existing_ids.add(str(task["task_id"]))
 
-        df.loc[len(df)] = {
+        new_rows.append({
             "meeting_id": mom_data["meeting_id"],
             "task_id": task["task_id"],
             "task_text": task["task_text"],
@@ -61,7 +76,11 @@ def add_tasks_from_mom(mom_data: dict):
             "created_by": mom_data["created_by"],
             "created_on": now,
             "completed_on": ""
-        }
+        })
+
+    if new_rows:
+        # Keys outside the registry's columns are dropped, as row assignment did
+        df = pd.concat([df, pd.DataFrame(new_rows, columns=df.columns)], ignore_index=True)
 
     save_registry(df)
 
@@ -79,26 +98,19 @@ def append_tasks(tasks):
         print(f"📝 Attempting to save {len(tasks)} tasks to {TASK_FILE}...")
         
         # Ensure data directory exists
-        Path("data").mkdir(exist_ok=True)
+        Path(TASK_FILE).parent.mkdir(parents=True, exist_ok=True)
         
-        # Load existing tasks or create new DataFrame
-        if Path(TASK_FILE).exists():
-            df_existing = pd.read_excel(TASK_FILE)
-            print(f"   ✓ Loaded {len(df_existing)} existing tasks")
-        else:
-            df_existing = pd.DataFrame()
-            print("   ℹ Creating new tasks registry file")
+        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Convert tasks to rows
-        new_rows = []
-        for task in tasks:
-            row = {
+        new_rows = [
+            {
                 "task_id": task.get("task_id"),
                 "meeting_id": task.get("meeting_id"),
                 "owner": task.get("owner"),
                 "task_text": task.get("task_text"),
                 "status": task.get("status", "OPEN"),
-                "created_on": task.get("created_on", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                "created_on": task.get("created_on", now_str),
                 "last_reminder_on": task.get("last_reminder_on"),
                 "last_reminder": task.get("last_reminder"),
                 "last_reminder_date": task.get("last_reminder_date"),
@@ -108,23 +120,43 @@ def append_tasks(tasks):
                 "days_taken": task.get("days_taken"),
                 "performance_rating": task.get("performance_rating")
             }
-            new_rows.append(row)
-        
-        # Create DataFrame from new tasks
-        df_new = pd.DataFrame(new_rows)
-        print(f"   ✓ Created DataFrame with {len(df_new)} new tasks")
-        
-        # Combine with existing
-        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        print(f"   ✓ Combined: {len(df_combined)} total tasks")
+            for task in tasks
+        ]
         
-        # Save to Excel
-        df_combined.to_excel(TASK_FILE, index=False)
+        # Other processes append too; hold the lock across load -> append -> save
+        with open(LOCK_FILE, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            
+            # Append rows to the existing sheet in place; only a new file is built from scratch
+            if Path(TASK_FILE).exists():
+                wb = load_workbook(TASK_FILE)
+                ws = wb.active
+                headers = [cell.value for cell in ws[1] if cell.value is not None]
+                print(f"   ✓ Loaded {ws.max_row - 1} existing tasks")
+            else:
+                wb = Workbook()
+                ws = wb.active
+                headers = []
+                print("   ℹ Creating new tasks registry file")
+            
+            # Header union over every row, so keys only later rows carry aren't dropped
+            keys = dict.fromkeys(k for row in new_rows for k in row)
+            missing = [k for k in keys if k not in headers]
+            if missing:
+                headers = headers + missing
+                for col_idx, col_name in enumerate(headers, start=1):
+                    ws.cell(row=1, column=col_idx).value = col_name
+            
+            for row in new_rows:
+                ws.append([row.get(h) for h in headers])
+            wb.save(TASK_FILE)
         print(f"   ✅ Saved {len(tasks)} tasks to {TASK_FILE}")
         
-        # Verify save
-        df_verify = pd.read_excel(TASK_FILE)
-        print(f"   ✓ Verified: {len(df_verify)} tasks in file")
+        # Verify save from the sheet dimensions rather than re-reading every row
+        wb = load_workbook(TASK_FILE, read_only=True)
+        print(f"   ✓ Verified: {wb.active.max_row - 1} tasks in file")
+        wb.close()
         
         return len(tasks)
         
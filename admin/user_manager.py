@@ -4,6 +4,7 @@ Multi-user support with role-based access control
 """
 
 import pandas as pd
+from utils.excel_handler import read_excel
 import hashlib
 import secrets
 from pathlib import Path
@@ -50,7 +51,7 @@ class UserManager:
         Returns:
             dict: User info if authenticated, None otherwise
         """
-        df = pd.read_excel(self.users_file)
+        df = read_excel(self.users_file)
         
         user_row = df[df['username'] == username]
         
@@ -181,7 +182,7 @@ class UserManager:
         Returns:
             bool: Success status
         """
-        df = pd.read_excel(self.users_file)
+        df = read_excel(self.users_file)
         
         # Check if username already exists
         if username in df['username'].values:
@@ -208,26 +209,26 @@ class UserManager:
     
     def list_users(self):
         """Get list of all users"""
-        df = pd.read_excel(self.users_file)
+        df = read_excel(self.users_file)
         return df[['username', 'full_name', 'email', 'role', 'department', 'is_active', 'last_login']]
     
     def deactivate_user(self, username):
         """Deactivate a user account"""
-        df = pd.read_excel(self.users_file)
+        df = read_excel(self.users_file)
         df.loc[df['username'] == username, 'is_active'] = False
         df.to_excel(self.users_file, index=False)
         return True
     
     def activate_user(self, username):
         """Activate a user account"""
-        df = pd.read_excel(self.users_file)
+        df = read_excel(self.users_file)
         df.loc[df['username'] == username, 'is_active'] = True
         df.to_excel(self.users_file, index=False)
         return True
     
     def change_password(self, username, new_password):
         """Change user password"""
-        df = pd.read_excel(self.users_file)
+        df = read_excel(self.users_file)
         df.loc[df['username'] == username, 'password_hash'] = self._hash_password(new_password)
         df.to_excel(self.users_file, index=False)
         return True
@@ -63,6 +63,7 @@ def create_test_tasks():
     print("=" * 60)
     
     created_count = 0
+    now = datetime.now()
     for task in test_tasks:
         try:
             result = excel_handler.add_entry(
@@ -70,7 +71,8 @@ def create_test_tasks():
                 owner=task['owner'],
                 due_date=task['due_date'],
                 remarks=task['remarks'],
-                priority=task['priority']
+                priority=task['priority'],
+                when=now
             )
             
             if result:
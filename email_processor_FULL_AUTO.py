@@ -5,6 +5,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 import pandas as pd
+from utils.excel_handler import read_excel
 
 # Import Smart Reply Processor and Acknowledgement Manager
 from smart_reply_processor import SmartReplyProcessor
@@ -136,23 +137,26 @@ class EmailProcessor:
             print("⚠️ Team Directory not found, skipping performance emails")
             return
         
-        team_df = pd.read_excel(team_file)
+        from utils.user_lookup import UserLookup
+        
+        team_df = read_excel(team_file)
+        # Name and email indexes built once per batch; each owner is a dict probe or
+        # a bisect over sorted suffixes, not a sheet scan
+        name_lookup = UserLookup(team_df, name_columns=['name'])
+        email_lookup = UserLookup(team_df, name_columns=['email'])
         
         for task in completed_tasks:
             try:
-                # Find owner's email
+                # Find owner's email: by name, else by email substring
                 owner = task.get('owner', '')
-                owner_row = team_df[
-                    team_df['Name'].str.contains(owner, case=False, na=False) |
-                    team_df['Email'].str.contains(owner, case=False, na=False)
-                ]
+                user = name_lookup.find_user(owner) or email_lookup.find_user(owner)
                 
-                if len(owner_row) == 0:
+                if user is None:
                     print(f"⚠️ No email found for {owner}")
                     continue
                 
-                owner_email = owner_row.iloc[0]['Email']
-                owner_full_name = owner_row.iloc[0]['Name']
+                owner_email = user['email']
+                owner_full_name = user['name']
                 
                 # Evaluate performance
                 deadline = pd.to_datetime(task.get('deadline'))
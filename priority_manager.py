@@ -20,15 +20,17 @@ def get_reminder_frequency(priority):
     }
     return frequency_map.get(priority.upper(), 3)
 
+# Built once at import; views look emojis up per task
+PRIORITY_EMOJI = {
+    'URGENT': '🔴',
+    'HIGH': '🟠',
+    'MEDIUM': '🟡',
+    'LOW': '🟢'
+}
+
 def get_priority_emoji(priority):
     """Get emoji for priority level"""
-    priority_map = {
-        'URGENT': '🔴',
-        'HIGH': '🟠',
-        'MEDIUM': '🟡',
-        'LOW': '🟢'
-    }
-    return priority_map.get(str(priority).upper(), '⚪')
+    return PRIORITY_EMOJI.get(str(priority).upper(), '⚪')
 
 def get_priority_color(priority):
     """Get color for priority level"""
@@ -26,17 +26,23 @@ except ImportError as e:
 
 # Import based on your structure
 try:
-    from utils.excel_handler import ExcelHandler
+    from utils.excel_handler import ExcelHandler, read_excel, write_excel
 except ImportError:
     # Fallback for direct testing
     class ExcelHandler:
         def __init__(self, filepath):
             self.filepath = filepath
         def load_data(self):
-            return pd.read_excel(self.filepath)
+            return read_excel(self.filepath)
         def save_data(self, df):
             df.to_excel(self.filepath, index=False)
 
+    def write_excel(df, path):
+        df.to_excel(path, index=False)
+
+    def read_excel(path, **kwargs):
+        return pd.read_excel(path, **kwargs)
+
 # -----------------------------
 # PATHS
 # -----------------------------
@@ -126,7 +132,7 @@ def load_team_directory():
         return {}
     
     try:
-        df = pd.read_excel(TEAM_FILE, engine='openpyxl')
+        df = read_excel(TEAM_FILE)
         print(f"✅ Loaded team directory with {len(df)} rows")
         
         # Your columns: username, full_name, email
@@ -448,7 +454,7 @@ def send_reminders(force_first=False, debug=False):
     
     try:
         # Load data
-        df = pd.read_excel(REGISTRY_FILE)
+        df = read_excel(REGISTRY_FILE)
         print(f"📊 Loaded {len(df)} tasks from registry")
         
         # Show status distribution
@@ -546,7 +552,7 @@ def send_reminders(force_first=False, debug=False):
         # Save updates if any emails were sent
         if sent_total > 0 and not debug:
             try:
-                df.to_excel(REGISTRY_FILE, index=False)
+                write_excel(df, REGISTRY_FILE)
                 print(f"\n💾 Updated {len(df[df['Last Reminder Date'] == now_str])} tasks in registry")
             except Exception as e:
                 print(f"❌ Failed to save registry: {e}")
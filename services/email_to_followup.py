@@ -42,17 +42,14 @@ def process_emails(limit=10):
     excel = ExcelHandler(EXCEL_FILE_PATH)
     df = excel.load_data()
 
-    created = 0
+    # Duplicate protection: IDs already in the sheet plus those added this run
+    seen_ids = set(df["Message ID"].astype(str)) if "Message ID" in df.columns else set()
+    new_rows = []
 
     for msg in messages:
         msg_id = msg["id"]
 
-        # Duplicate protection
-        if (
-            not df.empty
-            and "Message ID" in df.columns
-            and msg_id in df["Message ID"].astype(str).values
-        ):
+        if msg_id in seen_ids:
             continue
 
         subject = msg.get("subject", "")
@@ -76,11 +73,15 @@ def process_emails(limit=10):
             "Source": "Email"
         }
 
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        created += 1
+        new_rows.append(new_row)
+        seen_ids.add(msg_id)
+
+    # Grow the frame once for the whole batch
+    if new_rows:
+        df = pd.concat([df, pd.DataFrame(new_rows)], ignore_index=True)
 
     excel.save_data(df)
-    return created
+    return len(new_rows)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ Smart Reply Processor - Automatically process employee status update emails
 
 import re
 import pandas as pd
+from utils.excel_handler import read_excel
 from pathlib import Path
 from datetime import datetime
 
@@ -144,7 +145,7 @@ class SmartReplyProcessor:
                 'pending': []
             }
         
-        df = pd.read_excel(self.task_registry_path)
+        df = read_excel(self.task_registry_path)
         
         completed_tasks = []
         pending_tasks = []
@@ -9,18 +9,22 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 import sys
-import importlib
+import importlib.util
 import inspect
 from datetime import datetime
 
-from utils.excel_handler import ExcelHandler
+from utils.excel_handler import ExcelHandler, read_excel, write_excel
 from file_utils import safe_excel_operation, create_file_if_not_exists, backup_file, FileLockError
+from views.bulk_upload import UPLOAD_TEXT_DTYPES
 
-# Get the base directory more reliably
-if "__file__" in globals():
-    BASE_DIR = Path(__file__).resolve().parent
-else:
-    BASE_DIR = Path(os.getcwd())
+# Get the base directory more reliably (resolved once, not on every rerun)
+@st.cache_resource(show_spinner=False)
+def get_base_dir():
+    if "__file__" in globals():
+        return Path(__file__).resolve().parent
+    return Path(os.getcwd())
+
+BASE_DIR = get_base_dir()
 
 # Excel file path
 REGISTRY_FILE = BASE_DIR / "data" / "tasks_registry.xlsx"
@@ -58,7 +62,7 @@ def save_tasks_to_registry(df: pd.DataFrame):
         st.warning(f"⚠️ Could not create backup: {e}")
 
     def write_operation(file_path):
-        df.to_excel(file_path, index=False)
+        write_excel(df, file_path)
 
     try:
         safe_excel_operation(REGISTRY_FILE, write_operation)
@@ -69,11 +73,22 @@ def save_tasks_to_registry(df: pd.DataFrame):
     except Exception as e:
         st.error(f"❌ Unexpected error: {e}")
 
+@st.cache_resource(show_spinner=False)
+def load_excel_handler():
+    """One shared ExcelHandler per process, so its in-memory frame survives reruns."""
+    ensure_registry_exists()
+    return ExcelHandler(str(REGISTRY_FILE))
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_tasks_df(path: str, mtime: float) -> pd.DataFrame:
+    """Registry sheet as a DataFrame; mtime is only there to key the cache on file changes."""
+    return read_excel(path)
+
 def get_excel_handler():
     """Get ExcelHandler with correct path (Cloud-safe)."""
     try:
-        ensure_registry_exists()
-        return ExcelHandler(str(REGISTRY_FILE))
+        # Failures raise out of the cached loader, so they're retried on the next rerun
+        return load_excel_handler()
     except Exception as e:
         st.error(f"❌ Error initializing ExcelHandler: {e}")
         st.exception(e)
@@ -91,9 +106,15 @@ st.set_page_config(
 with st.sidebar:
     debug_mode = st.toggle("🛠 Debug mode", value=False)
 
+@st.cache_resource(show_spinner=False)
+def get_debug_paths():
+    """Where ExcelHandler and openpyxl were loaded from; looked up once per process."""
+    return inspect.getfile(ExcelHandler), importlib.util.find_spec("openpyxl")
+
 if debug_mode:
-    st.sidebar.info(f"ExcelHandler loaded from: {inspect.getfile(ExcelHandler)}")
-    st.sidebar.info(f"openpyxl spec: {importlib.util.find_spec('openpyxl')}")
+    handler_file, openpyxl_spec = get_debug_paths()
+    st.sidebar.info(f"ExcelHandler loaded from: {handler_file}")
+    st.sidebar.info(f"openpyxl spec: {openpyxl_spec}")
 
 # Custom CSS with logo shifted right
 st.markdown("""
@@ -296,6 +317,59 @@ def show_manual_entry():
         st.error(f"❌ Error: {e}")
         st.exception(e)
 
+# ---------- bulk upload helpers ----------
+# Module level so they're defined once and are picklable, e.g. for chunked workers
+def clean(v):
+    if v is None:
+        return ""
+    if isinstance(v, float) and pd.isna(v):
+        return ""
+    return str(v).strip()
+
+def normalize_priority(v, fallback="MEDIUM"):
+    s = clean(v).upper()
+    if not s:
+        return fallback
+    aliases = {"MED": "MEDIUM", "MID": "MEDIUM", "URG": "URGENT", "NORMAL": "MEDIUM"}
+    s = aliases.get(s, s)
+    if s not in ["URGENT", "HIGH", "MEDIUM", "LOW"]:
+        return fallback
+    return s
+
+def parse_due_date_with_fallback(v, fallback_str):
+    """Parse due date; if missing/unparseable, return fallback_str."""
+    s = clean(v)
+    if not s:
+        return fallback_str
+    try:
+        return pd.to_datetime(s, dayfirst=True, errors="raise").strftime("%Y-%m-%d")
+    except Exception:
+        return fallback_str
+
+# Column-wise versions of the helpers above, for whole uploaded tables
+def clean_col(s):
+    return s.astype("string").str.strip().fillna("")
+
+def normalize_priority_col(s, fallback="MEDIUM"):
+    aliases = {"MED": "MEDIUM", "MID": "MEDIUM", "URG": "URGENT", "NORMAL": "MEDIUM"}
+    s = clean_col(s).str.upper().replace(aliases)
+    return s.where(s.isin(["URGENT", "HIGH", "MEDIUM", "LOW"]), fallback)
+
+def parse_due_date_col(s, fallback_str):
+    """parse_due_date_with_fallback for a column: one vectorized parse, per-value fallback for the rest."""
+    s = clean_col(s)
+    out = pd.to_datetime(s, dayfirst=True, errors="coerce").dt.strftime("%Y-%m-%d")
+
+    # Values in a different format than the column's inferred one (or unparseable)
+    rest = out.isna()
+    if rest.any():
+        parsed = {v: parse_due_date_with_fallback(v, fallback_str) for v in s[rest].unique()}
+        out[rest] = s[rest].map(parsed)
+    return out
+
+def first_line_col(s):
+    return s.str.split(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]", n=1, regex=True).str[0]
+
 def show_bulk_upload():
     import pandas as pd
     import streamlit as st
@@ -319,33 +393,6 @@ def show_bulk_upload():
         st.session_state.setdefault(k, "" if k != "bulk_tasks" else [])
 
     # ---------- helpers ----------
-    def clean(v):
-        if v is None:
-            return ""
-        if isinstance(v, float) and pd.isna(v):
-            return ""
-        return str(v).strip()
-
-    def normalize_priority(v, fallback="MEDIUM"):
-        s = clean(v).upper()
-        if not s:
-            return fallback
-        aliases = {"MED": "MEDIUM", "MID": "MEDIUM", "URG": "URGENT", "NORMAL": "MEDIUM"}
-        s = aliases.get(s, s)
-        if s not in ["URGENT", "HIGH", "MEDIUM", "LOW"]:
-            return fallback
-        return s
-
-    def parse_due_date_with_fallback(v, fallback_str):
-        """Parse due date; if missing/unparseable, return fallback_str."""
-        s = clean(v)
-        if not s:
-            return fallback_str
-        try:
-            return pd.to_datetime(s, dayfirst=True, errors="raise").strftime("%Y-%m-%d")
-        except Exception:
-            return fallback_str
-
     def parse_mom_lines_to_tasks(lines, default_due_date_str, default_priority, default_status):
         """
         Converts MOM text lines into tasks.
@@ -453,7 +500,7 @@ def show_bulk_upload():
     # ---------- read file ----------
     try:
         if uploaded_file.name.lower().endswith(".xlsx"):
-            df = pd.read_excel(uploaded_file, engine="openpyxl")
+            df = read_excel(uploaded_file, dtype=UPLOAD_TEXT_DTYPES)
 
         elif uploaded_file.name.lower().endswith(".csv"):
             uploaded_file.seek(0)
@@ -462,7 +509,8 @@ def show_bulk_upload():
                 sep=None,
                 engine="python",
                 encoding="utf-8",
-                on_bad_lines="skip"
+                on_bad_lines="skip",
+                dtype=UPLOAD_TEXT_DTYPES
             )
 
             # Detect MOM text-style CSV (1 column and header is a long sentence)
@@ -521,71 +569,75 @@ def show_bulk_upload():
             st.warning("Select at least Owner and Remarks columns to continue.")
             return
 
-        # Build tasks list from mapped table
+        # Build tasks list from mapped table, column-wise
         df2 = df.dropna(how="all")
-        tasks = []
-
-        for idx, row in df2.iterrows():
-            meeting_id_val = clean(row.get(st.session_state["subject_col"])) if st.session_state["subject_col"] else ""
-            owner_val = clean(row.get(st.session_state["owner_col"]))
-            remarks_val = clean(row.get(st.session_state["remarks_col"]))
-            cc_val = clean(row.get(st.session_state["cc_col"])) if st.session_state["cc_col"] else ""
+        empty = pd.Series("", index=df2.index, dtype="string")
+        mapped = lambda key: clean_col(df2[st.session_state[key]]) if st.session_state[key] else empty
 
-            # Due Date from file if mapped, else default_due_date_str
-            if st.session_state["due_date_col"]:
-                due_val = parse_due_date_with_fallback(row.get(st.session_state["due_date_col"]), default_due_date_str)
-            else:
-                due_val = default_due_date_str
+        meeting_ids = mapped("subject_col")
+        owners = clean_col(df2[st.session_state["owner_col"]])
+        remarks = clean_col(df2[st.session_state["remarks_col"]])
 
-            # Priority from file if mapped, else default_priority
-            priority_raw = clean(row.get(st.session_state["priority_col"])) if st.session_state["priority_col"] else ""
-            priority_final = normalize_priority(priority_raw, default_priority)
-
-            if not owner_val and not remarks_val and not meeting_id_val:
-                continue
-
-            subject_text = (remarks_val.splitlines()[0] if remarks_val else f"Task {idx+1}")[:80]
+        # Due Date from file if mapped, else default_due_date_str
+        if st.session_state["due_date_col"]:
+            dues = parse_due_date_col(df2[st.session_state["due_date_col"]], default_due_date_str)
+        else:
+            dues = default_due_date_str
 
-            tasks.append({
-                "meeting_id": meeting_id_val,
-                "Owner": owner_val or "Unassigned",
-                "Subject": subject_text,
-                "Due Date": due_val,
-                "Remarks": remarks_val,
-                "Priority": priority_final,
-                "Status": default_status,
-                "CC": cc_val
-            })
+        # Priority from file if mapped, else default_priority
+        if st.session_state["priority_col"]:
+            priorities_col = normalize_priority_col(df2[st.session_state["priority_col"]], default_priority)
+        else:
+            priorities_col = default_priority
+
+        row_labels = "Task " + pd.Series(df2.index + 1, index=df2.index).astype(str)
+        subjects = first_line_col(remarks).where(remarks != "", row_labels).str[:80]
+
+        tasks_df = pd.DataFrame({
+            "meeting_id": meeting_ids,
+            "Owner": owners.where(owners != "", "Unassigned"),
+            "Subject": subjects,
+            "Due Date": dues,
+            "Remarks": remarks,
+            "Priority": priorities_col,
+            "Status": default_status,
+            "CC": mapped("cc_col")
+        }, index=df2.index)
+        keep = (owners != "") | (remarks != "") | (meeting_ids != "")
+        tasks = tasks_df[keep].astype(object).to_dict("records")
 
         st.session_state["bulk_tasks"] = tasks
 
     else:
         # df already contains tasks (from MOM conversion)
-        tasks = []
         df2 = df.dropna(how="all")
-
-        for idx, row in df2.iterrows():
-            owner_val = clean(row.get("Owner"))
-            remarks_val = clean(row.get("Remarks"))
-
-            if not owner_val and not remarks_val:
-                continue
-
-            due_val = parse_due_date_with_fallback(row.get("Due Date"), default_due_date_str)
-            pr = normalize_priority(row.get("Priority"), default_priority)
-
-            subject_text = clean(row.get("Subject")) or (remarks_val.splitlines()[0] if remarks_val else f"Task {idx+1}")[:80]
-
-            tasks.append({
-                "meeting_id": clean(row.get("meeting_id")) or clean(row.get("Subject")) or "MOM-001",
-                "Owner": owner_val or "Unassigned",
-                "Subject": subject_text,
-                "Due Date": due_val,
-                "Remarks": remarks_val,
-                "Priority": pr,
-                "Status": default_status,
-                "CC": clean(row.get("CC"))
-            })
+        empty = pd.Series("", index=df2.index, dtype="string")
+        column = lambda name: clean_col(df2[name]) if name in df2.columns else empty
+
+        owners = column("Owner")
+        remarks = column("Remarks")
+        subjects_in = column("Subject")
+        meeting_ids = column("meeting_id")
+
+        row_labels = "Task " + pd.Series(df2.index + 1, index=df2.index).astype(str)
+        subjects = subjects_in.where(
+            subjects_in != "",
+            first_line_col(remarks).where(remarks != "", row_labels).str[:80]
+        )
+        meeting_ids = meeting_ids.where(meeting_ids != "", subjects_in.where(subjects_in != "", "MOM-001"))
+
+        tasks_df = pd.DataFrame({
+            "meeting_id": meeting_ids,
+            "Owner": owners.where(owners != "", "Unassigned"),
+            "Subject": subjects,
+            "Due Date": parse_due_date_col(df2["Due Date"], default_due_date_str),
+            "Remarks": remarks,
+            "Priority": normalize_priority_col(df2["Priority"], default_priority) if "Priority" in df2.columns else default_priority,
+            "Status": default_status,
+            "CC": column("CC")
+        }, index=df2.index)
+        keep = (owners != "") | (remarks != "")
+        tasks = tasks_df[keep].astype(object).to_dict("records")
 
         st.session_state["bulk_tasks"] = tasks
 
@@ -602,6 +654,13 @@ def show_bulk_upload():
 
     priorities = ["URGENT", "HIGH", "MEDIUM", "LOW"]
 
+    # Every row's current due date in one vectorized parse instead of one per widget
+    current_dues = pd.to_datetime(
+        pd.Series([t.get("Due Date", default_due_date_str) for t in tasks_list], dtype=object),
+        errors="coerce",
+        format="mixed"
+    )
+
     edited = []
     for i, t in enumerate(tasks_list):
         with st.container(border=True):
@@ -623,10 +682,7 @@ def show_bulk_upload():
 
             with c3:
                 # Due date editable per row
-                try:
-                    current_due = pd.to_datetime(t.get("Due Date", default_due_date_str)).date()
-                except Exception:
-                    current_due = default_due_date
+                current_due = current_dues.iloc[i].date() if pd.notna(current_dues.iloc[i]) else default_due_date
                 due = st.date_input("Due Date", value=current_due, key=f"due_row_{i}")
 
             with c4:
@@ -668,16 +724,14 @@ def show_bulk_upload():
                 st.error("❌ Could not initialize ExcelHandler")
                 st.stop()
 
-            created = 0
-            errors = 0
-
-            for i, t in enumerate(st.session_state.get("bulk_tasks", [])):
-                try:
-                    excel_handler.add_task(t)
-                    created += 1
-                except Exception as e:
-                    errors += 1
-                    st.error(f"Failed on task {i+1}: {e}")
+            bulk_tasks = st.session_state.get("bulk_tasks", [])
+            try:
+                # One registry write for the whole upload
+                created = excel_handler.bulk_append(bulk_tasks)
+            except Exception as e:
+                created = 0
+                st.error(f"Failed to create tasks: {e}")
+            errors = len(bulk_tasks) - created
 
             st.success(f"✅ Created {created} tasks. Errors: {errors}")
             if created > 0:
@@ -906,8 +960,8 @@ def find_missing_owners():
     
     try:
         # Load data
-        tasks_df = pd.read_excel(registry_path)
-        team_df = pd.read_excel(team_path)
+        tasks_df = load_tasks_df(str(registry_path), registry_path.stat().st_mtime)
+        team_df = read_excel(team_path)
         
         # Get unique active task owners
         active_statuses = ['OPEN', 'PENDING', 'IN PROGRESS']
@@ -925,8 +979,8 @@ def find_missing_owners():
                 first_name = full_name.split()[0].lower()
                 team_map[first_name] = email
         
-        # Find missing mappings
-        missing = []
+        # Find missing mappings (dict keeps first-seen order with O(1) membership)
+        missing = {}
         for owner in unique_owners:
             if not isinstance(owner, str):
                 continue
@@ -940,11 +994,10 @@ def find_missing_owners():
             for part in parts:
                 part_clean = part.strip()
                 if part_clean and part_clean not in team_map:
-                    if part_clean not in missing:
-                        missing.append(part_clean)
+                    missing[part_clean] = None
         
         if missing:
-            return f"⚠️ Found {len(missing)} missing owners: {', '.join(missing[:10])}..."
+            return f"⚠️ Found {len(missing)} missing owners: {', '.join(list(missing)[:10])}..."
         else:
             return "✅ All owners have email mappings!"
         
@@ -1094,7 +1147,7 @@ def test_reminder_logic_safe():
         if registry_path.exists():
             import pandas as pd
             try:
-                df = pd.read_excel(registry_path)
+                df = load_tasks_df(str(registry_path), registry_path.stat().st_mtime)
                 results.append(f"Registry tasks: {len(df)}")
                 open_tasks = df[df['Status'].isin(['OPEN', 'PENDING', 'IN PROGRESS'])]
                 results.append(f"Active tasks: {len(open_tasks)}")
@@ -1,16 +1,127 @@
 # -*- coding: utf-8 -*-
 
+import atexit
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
+from io import BytesIO
+import json
 import os
+import re
+import threading
 import warnings
 import uuid
 from openpyxl import Workbook, load_workbook
 
+try:
+    from python_calamine import CalamineWorkbook
+except ModuleNotFoundError:
+    CalamineWorkbook = None
+
+try:
+    import pyarrow
+except ModuleNotFoundError:
+    pyarrow = None
+
+try:
+    import xlsxwriter
+except ModuleNotFoundError:
+    xlsxwriter = None
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    # Not on Windows; the task_id counter then relies on the atomic replace only
+    fcntl = None
+
 warnings.filterwarnings("ignore")
 
 
+def read_excel(path, **kwargs) -> pd.DataFrame:
+    """pd.read_excel through the Rust calamine engine when available, else openpyxl."""
+    if CalamineWorkbook is not None:
+        try:
+            return pd.read_excel(path, engine="calamine", **kwargs)
+        except ValueError:
+            # pandas < 2.2 doesn't know the calamine engine
+            pass
+    return pd.read_excel(path, engine="openpyxl", **kwargs)
+
+
+def parquet_mirror_path(excel_path) -> str:
+    """Path of the columnar mirror ExcelHandler keeps next to a registry workbook."""
+    return os.path.splitext(str(excel_path))[0] + ".parquet"
+
+
+def read_parquet_mirror(excel_path, mtime_ns: int):
+    """The workbook's parquet mirror if it was written after mtime_ns (the xlsx's), else None."""
+    if pyarrow is None:
+        return None
+    mirror = parquet_mirror_path(excel_path)
+    try:
+        if os.stat(mirror).st_mtime_ns < mtime_ns:
+            return None
+        return pd.read_parquet(mirror)
+    except (OSError, ValueError, pyarrow.ArrowException):
+        return None
+
+
+def _column_values(series: pd.Series) -> list:
+    """A column as plain Python values with missing entries as None.
+
+    pyarrow does the conversion in one native pass; columns it can't type
+    (mixed objects) fall back to a vectorized pandas mask.
+    """
+    if pyarrow is not None:
+        try:
+            return pyarrow.array(series, from_pandas=True).to_pylist()
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError):
+            pass
+    values = series.astype(object)
+    return values.where(series.notna(), None).tolist()
+
+
+def write_excel(df: pd.DataFrame, path, sheet_name: str = "Sheet1") -> None:
+    """Write df (header + rows, no index) as a fresh workbook, streaming row by row.
+
+    path may be a filesystem path or a binary file object such as BytesIO.
+
+    Uses xlsxwriter's constant_memory mode when available, else an openpyxl
+    write-only workbook. pandas' own to_excel writes column by column, which
+    constant_memory can't take, so rows are written directly.
+    """
+    # Convert column by column (nulls -> None in one pass) instead of testing every cell
+    rows = zip(*(_column_values(df.iloc[:, i]) for i in range(df.shape[1])))
+
+    if xlsxwriter is not None:
+        # Keep text cells literal rather than turning them into formulas/links
+        wb = xlsxwriter.Workbook(path if hasattr(path, "write") else str(path), {
+            "constant_memory": True,
+            "use_zip64": True,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "remove_timezone": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        })
+        ws = wb.add_worksheet(sheet_name)
+        ws.write_row(0, 0, [str(c) for c in df.columns])
+        for i, values in enumerate(rows, start=1):
+            ws.write_row(i, 0, values)
+        wb.close()
+        return
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append(list(df.columns))
+    for values in rows:
+        ws.append(values)
+    wb.save(path)
+
+
 class ExcelHandler:
+    # Identifier columns are always text; pinning them avoids per-load inference
+    # and gives the task_id prefix scans a real string dtype.
+    READ_DTYPES = {"task_id": "string", "meeting_id": "string"}
+
     def __init__(self, excel_path: str):
         self.excel_path = excel_path
 
@@ -32,6 +143,29 @@ class ExcelHandler:
             "Auto Reply Sent"
         ]
 
+        # Per-prefix task_id counters, so add_entry doesn't scan the registry
+        self._seq_path = self.excel_path + ".seq.json"
+
+        # Columnar mirror of the registry, rewritten on every save. The xlsx stays
+        # the source of truth; the mirror is only read while it is newer.
+        self.parquet_path = parquet_mirror_path(self.excel_path)
+
+        # Last loaded/saved frame, valid while the file's (mtime, size) is unchanged.
+        # While _dirty, it (plus _pending_rows) holds deferred writes flush() hasn't saved.
+        self._df_cache = None
+        self._df_stamp = None
+        self._dirty = False
+        self._flush_at_exit = False
+        # Deferred appends as row lists in required_columns order, folded into
+        # _df_cache in one concat when a frame is next needed
+        self._pending_rows = []
+        # Every deferred append (row lists) and update ((task_id, index, values))
+        # since the last save, replayed onto a fresh read if another writer
+        # changes the file before flush()
+        self._deferred_rows = []
+        self._deferred_updates = []
+        self._lock = threading.Lock()
+
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -49,7 +183,7 @@ class ExcelHandler:
             return
 
         wb = load_workbook(self.excel_path)
-        ws = wb["Tasks"] if "Tasks" in wb.sheetnames else wb.active
+        ws = self._tasks_sheet(wb)
 
         header = [cell.value for cell in ws[1] if cell.value is not None]
         if not header:
@@ -64,17 +198,34 @@ class ExcelHandler:
                 ws.cell(row=1, column=col_idx).value = col_name
             wb.save(self.excel_path)
 
-    def add_task(self, task_data: dict) -> None:
-        """Append one task row to the registry."""
+    def add_task(self, task_data: dict, defer: bool = False) -> None:
+        """Append one task row to the registry (held in memory until flush() if defer)."""
+        task_data = self._with_task_defaults(task_data)
+        if defer:
+            self.append_rows([task_data], defer=True)
+            return
+
+        self.flush()
         wb = load_workbook(self.excel_path)
-        ws = wb["Tasks"] if "Tasks" in wb.sheetnames else wb.active
+        ws = self._tasks_sheet(wb)
 
         headers = [cell.value for cell in ws[1] if cell.value is not None]
         if not headers:
             headers = self.required_columns
             ws.append(headers)
 
-        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        missing = [c for c in self.required_columns if c not in headers]
+        if missing:
+            headers = headers + missing
+            for col_idx, col_name in enumerate(headers, start=1):
+                ws.cell(row=1, column=col_idx).value = col_name
+
+        ws.append([task_data.get(h, "") for h in headers])
+        wb.save(self.excel_path)
+
+    @staticmethod
+    def _with_task_defaults(task_data: dict, now_str: str = None) -> dict:
+        now_str = now_str or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         task_data = dict(task_data)
         task_data.setdefault("task_id", str(uuid.uuid4()))
@@ -87,45 +238,226 @@ class ExcelHandler:
         task_data.setdefault("Last Reminder On", "")
         task_data.setdefault("Completed Date", "")
         task_data.setdefault("Auto Reply Sent", "")
+        return task_data
+
+    @staticmethod
+    def _tasks_sheet(wb):
+        return wb["Tasks"] if "Tasks" in wb.sheetnames else wb.active
+
+    @staticmethod
+    def _calamine_value(value):
+        """Match openpyxl's cell values: None for empty, int for integral numbers, datetime for dates."""
+        if value == "":
+            return None
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if type(value) is date:
+            return datetime(value.year, value.month, value.day)
+        return value
+
+    def _iter_rows(self):
+        """Yield sheet rows as value tuples (header first); empty cells are None."""
+        if CalamineWorkbook is not None:
+            wb = CalamineWorkbook.from_path(self.excel_path)
+            name = "Tasks" if "Tasks" in wb.sheet_names else wb.sheet_names[0]
+            for values in wb.get_sheet_by_name(name).to_python():
+                yield tuple(self._calamine_value(v) for v in values)
+            return
 
-        missing = [c for c in self.required_columns if c not in headers]
+        wb = load_workbook(self.excel_path, read_only=True, data_only=True)
+        try:
+            yield from self._tasks_sheet(wb).iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+    def _read_frame(self) -> pd.DataFrame:
+        """Build the registry frame straight from streamed row tuples."""
+        rows = self._iter_rows()
+        header = next(rows, None)
+        if not header:
+            return pd.DataFrame()
+
+        data = [values for values in rows if any(v is not None for v in values)]
+        df = pd.DataFrame(data, columns=list(header))
+        # Unnamed columns are dropped; for duplicate headers the last column wins
+        keep = df.columns.notna() & ~df.columns.duplicated(keep="last")
+        return df.loc[:, keep]
+
+    def _with_required_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Project df onto required_columns, adding any missing ones in a single assign."""
+        missing = [c for c in self.required_columns if c not in df.columns]
         if missing:
-            headers = headers + missing
-            for col_idx, col_name in enumerate(headers, start=1):
-                ws.cell(row=1, column=col_idx).value = col_name
+            df = df.assign(**dict.fromkeys(missing))
+        return df[self.required_columns]
 
-        ws.append([task_data.get(h, "") for h in headers])
-        wb.save(self.excel_path)
+    def _file_stamp(self):
+        st = os.stat(self.excel_path)
+        return st.st_mtime_ns, st.st_size
 
     def load_data(self) -> pd.DataFrame:
         try:
-            if not os.path.exists(self.excel_path):
-                return pd.DataFrame(columns=self.required_columns)
-
-            df = pd.read_excel(self.excel_path, engine="openpyxl")
-
-            for col in self.required_columns:
-                if col not in df.columns:
-                    df[col] = None
-
-            return df[self.required_columns]
+            return self._frame().copy()
 
         except Exception as e:
             print(f"❌ Excel load error: {e}")
             return pd.DataFrame(columns=self.required_columns)
 
+    def _frame(self) -> pd.DataFrame:
+        """The cached registry frame itself (not a copy), with pending appends folded in."""
+        df = self._base_frame()
+        with self._lock:
+            if self._pending_rows:
+                new_df = pd.DataFrame(self._pending_rows, columns=self.required_columns).astype(self.READ_DTYPES)
+                self._df_cache = df = pd.concat([df, new_df], ignore_index=True)
+                self._pending_rows = []
+        return df
+
+    def _base_frame(self) -> pd.DataFrame:
+        """The cached frame without pending appends, reloaded when the file changed.
+
+        While deferred writes are pending, a reload replays them onto the fresh
+        frame, so rows other writers saved in the meantime are kept.
+        """
+        if not os.path.exists(self.excel_path):
+            with self._lock:
+                if self._dirty:
+                    return self._df_cache
+            return pd.DataFrame(columns=self.required_columns)
+
+        stamp = self._file_stamp()
+        with self._lock:
+            if self._df_cache is not None and self._df_stamp == stamp:
+                return self._df_cache
+
+        df = self._load_mirror(stamp)
+        if df is None:
+            df = self._read_frame()
+
+        df = self._with_required_columns(df).astype(self.READ_DTYPES)
+        with self._lock:
+            if self._dirty:
+                df = self._replay_deferred(df)
+            self._df_cache = df
+            self._df_stamp = stamp
+        return df
+
+    def _replay_deferred(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Apply the deferred appends and updates to df, a fresh read; the caller holds _lock."""
+        if self._deferred_rows:
+            new_df = pd.DataFrame(self._deferred_rows, columns=self.required_columns).astype(self.READ_DTYPES)
+            df = pd.concat([df, new_df], ignore_index=True)
+        # Pending rows are among the deferred ones just appended
+        self._pending_rows = []
+
+        for task_id, index, updates in self._deferred_updates:
+            if task_id is not None:
+                # Row positions may have shifted under other writers; the task_id hasn't
+                rows = df.index[df["task_id"].eq(task_id).to_numpy(dtype=bool, na_value=False)]
+            else:
+                rows = [index] if 0 <= index < len(df) else []
+            for row in rows:
+                for col, val in updates.items():
+                    if col in df.columns:
+                        df.at[row, col] = val
+        return df
+
+    def _load_mirror(self, stamp):
+        """Return the parquet mirror if it was written after the xlsx, else None."""
+        return read_parquet_mirror(self.excel_path, stamp[0])
+
+    def _save_mirror(self, df: pd.DataFrame) -> None:
+        if pyarrow is None:
+            return
+        try:
+            # Excel columns may mix text and dates cell by cell. Arrow columns can't,
+            # and converting them would make load_data's types depend on which file
+            # it read, so such a registry gets no mirror and is read from the xlsx
+            if any(
+                df[col].dtype == object and df[col].dropna().map(type).nunique() > 1
+                for col in df.columns
+            ):
+                self._drop_mirror()
+                return
+            df.to_parquet(self.parquet_path, index=False, compression="zstd")
+        except (OSError, ValueError, pyarrow.ArrowException) as e:
+            print(f"⚠️ Could not write parquet mirror: {e}")
+            self._drop_mirror()
+
+    def _drop_mirror(self) -> None:
+        """Remove the parquet mirror, so reads fall back to the xlsx."""
+        try:
+            os.remove(self.parquet_path)
+        except OSError:
+            pass
+
     def save_data(self, df: pd.DataFrame) -> bool:
         try:
-            for col in self.required_columns:
-                if col not in df.columns:
-                    df[col] = None
-            df = df[self.required_columns]
-            df.to_excel(self.excel_path, index=False, engine="openpyxl")
+            df = self._with_required_columns(df)
+
+            write_excel(df, self.excel_path, sheet_name="Tasks")
+            self._save_mirror(df)
+
+            with self._lock:
+                self._df_cache = df.copy()
+                self._df_stamp = self._file_stamp()
+                self._dirty = False
+                self._pending_rows = []
+                self._deferred_rows = []
+                self._deferred_updates = []
             return True
         except Exception as e:
             print(f"❌ Excel save error: {e}")
             return False
 
+    def export_xlsx(self) -> bytes:
+        """Current registry (including pending deferred writes) as xlsx bytes, for downloads."""
+        buffer = BytesIO()
+        write_excel(self._frame(), buffer, sheet_name="Tasks")
+        return buffer.getvalue()
+
+    def _next_seq(self, task_id_prefix: str) -> int:
+        """Return the next sequence number for task_id_prefix from the sidecar counter.
+
+        The app, cron and email processes share the counter, so the read-increment-write
+        runs under an exclusive lock and the new counter replaces the old atomically.
+        """
+        with open(self._seq_path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # Closing the lock file releases the lock
+            return self._next_seq_locked(task_id_prefix)
+
+    def _next_seq_locked(self, task_id_prefix: str) -> int:
+        try:
+            with open(self._seq_path, encoding="utf-8") as f:
+                seq = json.load(f)
+        except (OSError, ValueError):
+            seq = {}
+
+        if task_id_prefix not in seq:
+            # New prefix (or no sidecar yet): seed once from the highest id already in
+            # the registry, so deleted rows can't make a new id collide with a kept one.
+            # Prefixes are date-based, so older counters are dropped.
+            numbers = self._frame()["task_id"].str.extract(
+                rf"^{re.escape(task_id_prefix)}-(\d+)$", expand=False
+            ).dropna()
+            seq = {task_id_prefix: int(numbers.astype(int).max()) if len(numbers) else 0}
+
+        seq[task_id_prefix] += 1
+        tmp_path = f"{self._seq_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(seq, f)
+            os.replace(tmp_path, self._seq_path)
+        except OSError as e:
+            print(f"⚠️ Could not update task_id counter: {e}")
+        return seq[task_id_prefix]
+
+    def next_manual_task_id(self, now: datetime = None) -> str:
+        """Reserve the next MAN-YYYYMMDD-NNN task_id for a manually entered task."""
+        task_id_prefix = f"MAN-{(now or datetime.now()).strftime('%Y%m%d')}"
+        return f"{task_id_prefix}-{self._next_seq(task_id_prefix):03d}"
+
     def add_entry(
         self,
         subject: str,
@@ -135,23 +467,19 @@ class ExcelHandler:
         priority: str = "MEDIUM",
         cc: str = "",
         task_id: str = None,
-        meeting_id: str = None
+        meeting_id: str = None,
+        when: datetime = None
     ):
-        if not task_id:
-            today = datetime.now()
-            task_id_prefix = f"MAN-{today.strftime('%Y%m%d')}"
-            df = self.load_data()
-
-            if len(df) > 0 and "task_id" in df.columns:
-                today_manual_tasks = df[df["task_id"].astype(str).str.startswith(task_id_prefix, na=False)]
-                next_seq = len(today_manual_tasks) + 1
-            else:
-                next_seq = 1
+        # Batch callers pass one shared `when` so their rows carry the same timestamps
+        now = when or datetime.now()
+        now_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        today_str = now.strftime("%Y%m%d")
 
-            task_id = f"{task_id_prefix}-{next_seq:03d}"
+        if not task_id:
+            task_id = self.next_manual_task_id(now)
 
         if not meeting_id:
-            meeting_id = f"MANUAL-{datetime.now().strftime('%Y%m%d')}"
+            meeting_id = f"MANUAL-{today_str}"
 
         row = {
             "task_id": task_id,
@@ -163,8 +491,8 @@ class ExcelHandler:
             "Remarks": remarks,
             "Priority": priority,
             "Status": "OPEN",
-            "Created On": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "Created On": now_str,
+            "Last Updated": now_str,
             "Last Reminder Date": "",
             "Last Reminder On": "",
             "Completed Date": "",
@@ -175,42 +503,112 @@ class ExcelHandler:
     def append_row(self, row: dict):
         return self.append_rows([row])
 
-    def append_rows(self, rows: list):
+    def append_rows(self, rows: list, defer: bool = False):
+        """Append rows to the registry; with defer, only to the cached frame until flush()."""
         if not rows:
             return 0
 
-        df = self.load_data()
-        new_df = pd.DataFrame(rows)
+        if defer:
+            # O(k) list extend per call; the frame is rebuilt once, when next needed
+            columns = self.required_columns
+            base = self._base_frame()
+            with self._lock:
+                self._df_cache = base
+                new_rows = [[row.get(c) for c in columns] for row in rows]
+                self._pending_rows.extend(new_rows)
+                self._deferred_rows.extend(new_rows)
+                self._mark_dirty()
+                return len(base) + len(self._pending_rows)
+
+        self.flush()
+
+        # Append in place instead of reloading and rewriting the whole registry;
+        # the parquet mirror goes stale through the file's new mtime.
+        stamp = self._file_stamp()
+        with self._lock:
+            cached = self._df_cache if self._df_stamp == stamp else None
+
+        wb = load_workbook(self.excel_path)
+        ws = self._tasks_sheet(wb)
+
+        headers = [cell.value for cell in ws[1] if cell.value is not None]
+        missing = [c for c in self.required_columns if c not in headers]
+        if missing:
+            headers = headers + missing
+            for col_idx, col_name in enumerate(headers, start=1):
+                ws.cell(row=1, column=col_idx).value = col_name
 
-        for col in self.required_columns:
-            if col not in new_df.columns:
-                new_df[col] = None
+        for row in rows:
+            ws.append([row.get(h) for h in headers])
+        wb.save(self.excel_path)
 
-        new_df = new_df[self.required_columns]
-        combined = pd.concat([df, new_df], ignore_index=True)
-        self.save_data(combined)
-        return len(combined)
+        # A cache that matched the file before the append stays valid with the new
+        # rows added, so the next load_data() needn't re-read the whole workbook
+        if cached is not None:
+            columns = self.required_columns
+            new_df = pd.DataFrame([[row.get(c) for c in columns] for row in rows], columns=columns).astype(self.READ_DTYPES)
+            with self._lock:
+                self._df_cache = pd.concat([cached, new_df], ignore_index=True)
+                self._df_stamp = self._file_stamp()
+        return ws.max_row - 1
+
+    def bulk_append(self, tasks: list) -> int:
+        """Add many tasks with add_task defaults in a single registry write; returns the count saved."""
+        if not tasks:
+            return 0
+        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        columns = self.required_columns
+        new_df = pd.DataFrame(
+            [[row.get(c) for c in columns] for row in (self._with_task_defaults(t, now_str) for t in tasks)],
+            columns=columns,
+        ).astype(self.READ_DTYPES)
+        # Saved directly rather than deferred: a failed save leaves nothing behind
+        # for a later flush to write, so a re-upload can't duplicate the tasks
+        return len(tasks) if self.save_data(pd.concat([self._frame(), new_df], ignore_index=True)) else 0
+
+    def _mark_dirty(self) -> None:
+        """Record a deferred write; the caller holds _lock."""
+        self._dirty = True
+        if not self._flush_at_exit:
+            # Deferred writes still pending when the process exits are saved, not dropped
+            atexit.register(self.flush)
+            self._flush_at_exit = True
+
+    def flush(self) -> bool:
+        """Write deferred appends and updates to disk in one pass. No-op when nothing is pending."""
+        if not self._dirty:
+            return True
+        return self.save_data(self._frame().copy())
 
-    def update_row(self, index: int, updates: dict) -> bool:
+    def update_row(self, index: int, updates: dict, defer: bool = False) -> bool:
+        """Update one row; with defer, only in the cached frame until flush()."""
         try:
-            df = self.load_data()
+            # Deferred updates edit the cached frame in place, so K updates cost one save
+            df = self._frame() if defer else self.load_data()
             if index < 0 or index >= len(df):
                 return False
 
-            for col, val in updates.items():
-                if col in df.columns:
-                    df.at[index, col] = val
+            updates = {**updates, "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+            with self._lock:
+                for col, val in updates.items():
+                    if col in df.columns:
+                        df.at[index, col] = val
 
-            df.at[index, "Last Updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.save_data(df)
-            return True
+                if defer:
+                    task_id = df.at[index, "task_id"]
+                    self._deferred_updates.append((None if pd.isna(task_id) else task_id, index, updates))
+                    self._df_cache = df
+                    self._mark_dirty()
+                    return True
+
+            return self.save_data(df)
 
         except Exception as e:
             print(f"❌ update_row error: {e}")
             return False
 
-    def update_status(self, index: int, status: str) -> bool:
-        return self.update_row(index, {"Status": status})
+    def update_status(self, index: int, status: str, defer: bool = False) -> bool:
+        return self.update_row(index, {"Status": status}, defer=defer)
 
     def delete_row(self, index: int) -> bool:
         return self.update_row(index, {"Status": "DELETED"})
@@ -3,60 +3,99 @@ Priority Manager
 Determines task priority based on keywords, context, and deadline
 """
 
+import re
 from datetime import datetime, timedelta
-from typing import Literal
+from functools import lru_cache
+from typing import Final, Literal, Optional, Tuple
 
 PriorityLevel = Literal["urgent", "high", "medium", "low"]
 
 
 # ================= PRIORITY KEYWORDS =================
-URGENT_KEYWORDS = [
+URGENT_KEYWORDS: Final[Tuple[str, ...]] = (
     "urgent", "asap", "immediately", "critical", "emergency",
     "today", "now", "right away", "stat", "priority"
-]
+)
 
-HIGH_KEYWORDS = [
+HIGH_KEYWORDS: Final[Tuple[str, ...]] = (
     "important", "significant", "key", "essential", "vital",
     "crucial", "major", "serious", "pressing", "high priority"
-]
+)
 
-MEDIUM_KEYWORDS = [
+MEDIUM_KEYWORDS: Final[Tuple[str, ...]] = (
     "moderate", "regular", "normal", "standard", "routine",
     "typical", "ordinary", "medium priority"
-]
+)
 
-LOW_KEYWORDS = [
+LOW_KEYWORDS: Final[Tuple[str, ...]] = (
     "minor", "small", "low priority", "when possible", "eventually",
     "sometime", "nice to have", "optional"
-]
+)
 
 # ================= DEPARTMENT PRIORITY =================
-CRITICAL_DEPARTMENTS = [
+CRITICAL_DEPARTMENTS: Final[Tuple[str, ...]] = (
     "finance", "tax", "statutory", "compliance", "audit",
     "legal", "ceo", "board", "investor"
-]
+)
 
-HIGH_PRIORITY_DEPARTMENTS = [
+HIGH_PRIORITY_DEPARTMENTS: Final[Tuple[str, ...]] = (
     "hr", "operations", "sales", "customer", "client"
-]
+)
 
 # ================= TASK TYPE PRIORITY =================
-URGENT_TASK_TYPES = [
+URGENT_TASK_TYPES: Final[Tuple[str, ...]] = (
     "tds", "gst", "vat", "tax return", "filing", "deadline",
     "deposit", "payment", "statutory", "compliance"
-]
+)
 
-HIGH_TASK_TYPES = [
+HIGH_TASK_TYPES: Final[Tuple[str, ...]] = (
     "report", "presentation", "meeting", "review", "approval",
     "invoice", "agreement", "contract"
-]
+)
+
+
+def _any_of(*word_lists: Tuple[str, ...]) -> "re.Pattern[str]":
+    """One alternation regex matching any of the given substrings"""
+    words = sorted({w for words in word_lists for w in words}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(w) for w in words))
+
+
+# Compiled once: each rule below is a single scan instead of one `in` per keyword
+URGENT_TEXT_RE: Final = _any_of(URGENT_KEYWORDS, URGENT_TASK_TYPES)
+HIGH_TEXT_RE: Final = _any_of(HIGH_KEYWORDS, HIGH_TASK_TYPES)
+MEDIUM_TEXT_RE: Final = _any_of(MEDIUM_KEYWORDS)
+CRITICAL_DEPARTMENTS_RE: Final = _any_of(CRITICAL_DEPARTMENTS)
+HIGH_PRIORITY_DEPARTMENTS_RE: Final = _any_of(HIGH_PRIORITY_DEPARTMENTS)
+
+
+# Owners and MOM subjects repeat across tasks, so keyword results are memoized
+@lru_cache(maxsize=1024)
+def _keyword_level(full_text: str) -> Optional[PriorityLevel]:
+    """First keyword rule (urgent, high, medium) the lowercased text matches, else None"""
+    if URGENT_TEXT_RE.search(full_text):
+        return "urgent"
+    if HIGH_TEXT_RE.search(full_text):
+        return "high"
+    if MEDIUM_TEXT_RE.search(full_text):
+        return "medium"
+    return None
+
+
+@lru_cache(maxsize=256)
+def _department_level(owner_text: str) -> Optional[PriorityLevel]:
+    """Department rule (urgent, high) the lowercased owner matches, else None"""
+    if CRITICAL_DEPARTMENTS_RE.search(owner_text):
+        return "urgent"
+    if HIGH_PRIORITY_DEPARTMENTS_RE.search(owner_text):
+        return "high"
+    return None
 
 
 def determine_priority(
     task_text: str,
-    deadline_days: int = None,
-    owner: str = None,
-    mom_subject: str = None
+    deadline_days: Optional[int] = None,
+    owner: Optional[str] = None,
+    mom_subject: Optional[str] = None
 ) -> PriorityLevel:
     """
     Determine task priority based on multiple factors
@@ -77,52 +116,44 @@ def determine_priority(
     4. Low: Everything else OR no deadline
     """
     
-    # Combine all text for analysis
-    full_text = f"{task_text} {mom_subject or ''} {owner or ''}".lower()
-    
     # ============= RULE 1: URGENT =============
-    # Check urgent keywords
-    if any(keyword in full_text for keyword in URGENT_KEYWORDS):
-        return "urgent"
-    
-    # Check critical task types (tax, statutory, etc.)
-    if any(task_type in full_text for task_type in URGENT_TASK_TYPES):
+    # Scalar checks first; a tight deadline needs no text scan at all
+    if deadline_days is not None and deadline_days <= 2:
         return "urgent"
     
-    # Check deadline (less than 2 days)
-    if deadline_days is not None and deadline_days <= 2:
+    # Check critical departments (owner only, much shorter than the full text)
+    department_level = _department_level(owner.lower() if owner else "")
+    if department_level == "urgent":
         return "urgent"
     
-    # Check critical departments
-    if owner and any(dept in owner.lower() for dept in CRITICAL_DEPARTMENTS):
+    # Check urgent keywords and critical task types (tax, statutory, etc.)
+    full_text = f"{task_text} {mom_subject or ''} {owner or ''}".lower()
+    keyword_level = _keyword_level(full_text)
+    if keyword_level == "urgent":
         return "urgent"
     
     # ============= RULE 2: HIGH =============
-    # Check high keywords
-    if any(keyword in full_text for keyword in HIGH_KEYWORDS):
-        return "high"
-    
-    # Check high priority task types
-    if any(task_type in full_text for task_type in HIGH_TASK_TYPES):
-        return "high"
-    
     # Check deadline (less than 5 days)
     if deadline_days is not None and deadline_days <= 5:
         return "high"
     
     # Check high priority departments
-    if owner and any(dept in owner.lower() for dept in HIGH_PRIORITY_DEPARTMENTS):
+    if department_level == "high":
         return "high"
     
-    # ============= RULE 3: MEDIUM =============
-    # Check medium keywords
-    if any(keyword in full_text for keyword in MEDIUM_KEYWORDS):
-        return "medium"
+    # Check high keywords and high priority task types
+    if keyword_level == "high":
+        return "high"
     
+    # ============= RULE 3: MEDIUM =============
     # Check deadline (less than 10 days)
     if deadline_days is not None and deadline_days <= 10:
         return "medium"
     
+    # Check medium keywords
+    if keyword_level == "medium":
+        return "medium"
+    
     # ============= RULE 4: LOW (DEFAULT) =============
     return "low"
 
@@ -19,6 +19,7 @@ if not SMTP_PASSWORD:
 # ================= IMPORTS =====================
 import smtplib
 import pandas as pd
+from utils.excel_handler import read_excel
 from email.message import EmailMessage
 from datetime import datetime, timedelta
 # ==============================================
@@ -46,11 +47,23 @@ def resolve_email(owner: str):
     if "@" in owner:
         return owner
 
-    df = pd.read_excel(TEAM_FILE)
-    match = df[df["Name"].str.lower() == owner.lower()]
-    if not match.empty:
-        return match.iloc[0]["Email"]
-    return None
+    return load_team_emails().get(owner.lower())
+
+_team_emails = None
+
+def load_team_emails():
+    """
+    Lowercased Name -> Email from Team_Directory.xlsx,
+    read and lowercased once per run instead of per owner
+    """
+    global _team_emails
+    if _team_emails is None:
+        df = read_excel(TEAM_FILE)
+        _team_emails = {}
+        for name, email in zip(df["Name"].str.lower(), df["Email"]):
+            if isinstance(name, str):
+                _team_emails.setdefault(name, email)
+    return _team_emails
 
 def should_send_reminder(last_reminder):
     """
@@ -96,7 +109,7 @@ Task Followup Team
 
 # ================= MAIN LOGIC ==================
 def send_reminders():
-    df = pd.read_excel(TASK_FILE)
+    df = read_excel(TASK_FILE)
 
     # Only OPEN tasks
     df = df[df["status"] == "OPEN"]
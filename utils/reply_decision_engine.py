@@ -29,6 +29,15 @@ FYI_MARKERS = [
     "no action required"
 ]
 
+# One case-insensitive scan per marker list instead of lower() + a scan per marker
+QUESTION_RE = re.compile("|".join(re.escape(m) for m in QUESTION_MARKERS), re.IGNORECASE)
+FYI_RE = re.compile("|".join(re.escape(m) for m in FYI_MARKERS), re.IGNORECASE)
+# Both lists in one alternation (FYI first, so it wins on a shared start) to find
+# whichever marker comes first in a single scan
+REPLY_MARKERS_RE = re.compile(
+    f"(?P<fyi>{FYI_RE.pattern})|(?P<question>{QUESTION_RE.pattern})", re.IGNORECASE
+)
+
 # ==================================================
 # Helper detectors
 # ==================================================
@@ -36,16 +45,27 @@ def contains_question(text: str) -> bool:
     """
     Detects whether the mail requires a response
     """
-    t = text.lower()
-    return any(marker in t for marker in QUESTION_MARKERS)
+    return QUESTION_RE.search(text) is not None
 
 
 def is_fyi_mail(text: str) -> bool:
     """
     Detects FYI / no-action mails
     """
-    t = text.lower()
-    return any(marker in t for marker in FYI_MARKERS)
+    return FYI_RE.search(text) is not None
+
+
+def _scan_markers(text: str) -> tuple:
+    """
+    (is_fyi, has_question) for text, scanning it at most once
+    """
+    first = REPLY_MARKERS_RE.search(text)
+    if first is None:
+        return False, False
+    if first.lastgroup == "fyi":
+        return True, QUESTION_RE.search(text) is not None
+    # A question marker came first; only an FYI marker from there on can change the answer
+    return FYI_RE.search(text, first.start()) is not None, True
 
 
 # ==================================================
@@ -65,21 +85,28 @@ def decide_reply_type(
         TASK_CONFIRM
     """
 
+    # 1️⃣ MOM threads → never reply
+    if parsed_mom and parsed_mom.get("task_count", 0) > 0:
+        return "NO_REPLY"
+
+    # Every path below but ACK_ONLY ends in NO_REPLY, so without acks
+    # there's no need to join or scan the thread at all
+    if not ack_enabled:
+        return "NO_REPLY"
+
     full_text = " ".join(
-        msg.get("body", {}).get("content", "").lower()
+        msg.get("body", {}).get("content", "")
         for msg in thread_messages
     )
 
-    # 1️⃣ MOM threads → never reply
-    if parsed_mom and parsed_mom.get("task_count", 0) > 0:
-        return "NO_REPLY"
+    fyi, question = _scan_markers(full_text)
 
     # 2️⃣ FYI mails → never reply
-    if is_fyi_mail(full_text):
+    if fyi:
         return "NO_REPLY"
 
     # 3️⃣ Questions → ACK (only if enabled)
-    if ack_enabled and contains_question(full_text):
+    if question:
         return "ACK_ONLY"
 
     return "NO_REPLY"
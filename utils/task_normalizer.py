@@ -1,50 +1,68 @@
 """
 Task Normalizer - Standardizes task data format
 """
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
-def normalize_column_names(df):
+# Canonical column name for each stripped, lowercased header spelling
+CANONICAL_COLUMNS = {
+    'task_id': 'task_id',
+    'meeting_id': 'meeting_id',
+    'owner': 'Owner',
+    'subject': 'Subject',
+    'status': 'Status',
+    'priority': 'Priority',
+    'due_date': 'Due Date',
+    'due date': 'Due Date',
+    'cc': 'CC',
+    'remarks': 'Remarks',
+    'created_on': 'Created On',
+    'created on': 'Created On',
+    'last_updated': 'Last Updated',
+    'last updated': 'Last Updated',
+    'last_reminder_date': 'Last Reminder Date',
+    'last reminder date': 'Last Reminder Date',
+    'last_reminder_on': 'Last Reminder On',
+    'last reminder on': 'Last Reminder On',
+    'completed_date': 'Completed Date',
+    'completed date': 'Completed Date',
+    'auto_reply_sent': 'Auto Reply Sent',
+    'auto reply sent': 'Auto Reply Sent',
+    'last_reminder': 'last_reminder',
+    'days_taken': 'days_taken',
+    'performance_rating': 'performance_rating'
+}
+
+def normalize_column_names(df, inplace=False):
     """
     Normalize column names to standard format (Title Case)
     """
-    column_mapping = {
-        'task_id': 'task_id',
-        'meeting_id': 'meeting_id',
-        'owner': 'Owner',
-        'Owner': 'Owner',
-        'subject': 'Subject',
-        'Subject': 'Subject',
-        'status': 'Status',
-        'Status': 'Status',
-        'priority': 'Priority',
-        'Priority': 'Priority',
-        'due_date': 'Due Date',
-        'Due Date': 'Due Date',
-        'due date': 'Due Date',
-        'cc': 'CC',
-        'CC': 'CC',
-        'remarks': 'Remarks',
-        'Remarks': 'Remarks',
-        'created_on': 'Created On',
-        'Created On': 'Created On',
-        'last_updated': 'Last Updated',
-        'Last Updated': 'Last Updated',
-        'last_reminder_date': 'Last Reminder Date',
-        'Last Reminder Date': 'Last Reminder Date',
-        'last_reminder_on': 'Last Reminder On',
-        'Last Reminder On': 'Last Reminder On',
-        'completed_date': 'Completed Date',
-        'Completed Date': 'Completed Date',
-        'auto_reply_sent': 'Auto Reply Sent',
-        'Auto Reply Sent': 'Auto Reply Sent',
-        'last_reminder': 'last_reminder',
-        'days_taken': 'days_taken',
-        'performance_rating': 'performance_rating'
-    }
-    
-    df = df.rename(columns=column_mapping)
-    return df
+    renamed = df.rename(columns=lambda c: CANONICAL_COLUMNS.get(str(c).strip().lower(), c), inplace=inplace)
+    return df if inplace else renamed
+
+STATUS_MAPPING = {
+    'OPEN': 'OPEN',
+    'IN PROGRESS': 'OPEN',
+    'PENDING': 'OPEN',
+    'COMPLETED': 'COMPLETED',
+    'DONE': 'COMPLETED',
+    'CLOSED': 'COMPLETED',
+    'DELETED': 'DELETED',
+    'CANCELLED': 'DELETED'
+}
+
+PRIORITY_MAPPING = {
+    'URGENT': 'URGENT',
+    'HIGH': 'HIGH',
+    'MEDIUM': 'MEDIUM',
+    'NORMAL': 'MEDIUM',
+    'LOW': 'LOW'
+}
+
+# Normalized values only ever come from the mappings, so they make fixed categories
+STATUS_CATEGORIES = list(dict.fromkeys(STATUS_MAPPING.values()))
+PRIORITY_CATEGORIES = list(dict.fromkeys(PRIORITY_MAPPING.values()))
 
 def normalize_status(status):
     """Normalize status values"""
@@ -52,19 +70,7 @@ def normalize_status(status):
         return 'OPEN'
     
     status = str(status).strip().upper()
-    
-    status_mapping = {
-        'OPEN': 'OPEN',
-        'IN PROGRESS': 'OPEN',
-        'PENDING': 'OPEN',
-        'COMPLETED': 'COMPLETED',
-        'DONE': 'COMPLETED',
-        'CLOSED': 'COMPLETED',
-        'DELETED': 'DELETED',
-        'CANCELLED': 'DELETED'
-    }
-    
-    return status_mapping.get(status, 'OPEN')
+    return STATUS_MAPPING.get(status, 'OPEN')
 
 def normalize_priority(priority):
     """Normalize priority values"""
@@ -72,16 +78,7 @@ def normalize_priority(priority):
         return 'MEDIUM'
     
     priority = str(priority).strip().upper()
-    
-    priority_mapping = {
-        'URGENT': 'URGENT',
-        'HIGH': 'HIGH',
-        'MEDIUM': 'MEDIUM',
-        'NORMAL': 'MEDIUM',
-        'LOW': 'LOW'
-    }
-    
-    return priority_mapping.get(priority, 'MEDIUM')
+    return PRIORITY_MAPPING.get(priority, 'MEDIUM')
 
 def normalize_date(date_value):
     """Normalize date format to YYYY-MM-DD"""
@@ -100,20 +97,44 @@ def normalize_date(date_value):
     
     return date_value
 
-def normalize_tasks(df):
-    """Normalize entire task dataframe"""
-    df = normalize_column_names(df)
+def _map_column(col, mapping, default):
+    """Vectorized normalize_status/normalize_priority over a whole column"""
+    keys = col.astype(object).astype(str).str.strip().str.upper()
+    return keys.map(mapping).where(col.notna(), default).fillna(default)
+
+def _normalize_date_column(col):
+    """Vectorized normalize_date: each distinct cell is parsed and formatted once"""
+    # Registry dates repeat heavily, so work on the distinct values and map back
+    codes, uniques = pd.factorize(col.astype(object))
+    values = pd.Series(uniques, dtype=object)
+    parseable = values.map(lambda v: isinstance(v, (str, datetime)))
+    try:
+        parsed = pd.to_datetime(values.where(parseable), errors='coerce', format='mixed')
+        formatted = parsed.dt.strftime('%Y-%m-%d')
+        # Unparseable text and other types pass through unchanged
+        normalized = formatted.where(parsed.notna(), values).astype(object)
+    except (ValueError, TypeError):
+        # e.g. mixed timezones; fall back to the per-cell rules
+        normalized = values.map(normalize_date)
+    # Missing cells (code -1) become None
+    out = np.append(normalized.to_numpy(dtype=object), None)[codes]
+    return pd.Series(out, index=col.index, dtype=object)
+
+def normalize_tasks(df, copy=True):
+    """Normalize entire task dataframe; with copy=False the passed frame is modified in place"""
+    df = normalize_column_names(df, inplace=not copy)
     
+    # Stored as categoricals: 1-byte codes, and compares/groupbys work on the codes
     if 'Status' in df.columns:
-        df['Status'] = df['Status'].apply(normalize_status)
+        df['Status'] = pd.Categorical(_map_column(df['Status'], STATUS_MAPPING, 'OPEN'), categories=STATUS_CATEGORIES)
     
     if 'Priority' in df.columns:
-        df['Priority'] = df['Priority'].apply(normalize_priority)
+        df['Priority'] = pd.Categorical(_map_column(df['Priority'], PRIORITY_MAPPING, 'MEDIUM'), categories=PRIORITY_CATEGORIES)
     
     date_columns = ['Due Date', 'Created On', 'Last Updated', 'Completed Date']
     for col in date_columns:
         if col in df.columns:
-            df[col] = df[col].apply(normalize_date)
+            df[col] = _normalize_date_column(df[col])
     
     return df
 
@@ -2,63 +2,167 @@
 User Lookup Module - Final fixed version
 """
 import pandas as pd
+import threading
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
 
+from utils.excel_handler import read_excel
+
 # Use correct paths relative to project root
 BASE_DIR = Path(__file__).resolve().parent.parent  # Go up from utils/ to project root
 USERS_FILE = BASE_DIR / "data" / "users.xlsx"
 TEAM_FILE = BASE_DIR / "data" / "Team_Directory.xlsx"
 
+NAME_COLUMNS = ['full_name', 'name', 'employee name', 'full name', 'username']
+EMAIL_COLUMNS = ['email', 'email address', 'email_address', 'e-mail']
+
+
+def _first_present(columns, candidates):
+    """Return the first candidate column present in columns"""
+    for col in candidates:
+        if col in columns:
+            return col
+    return None
+
+
+class UserLookup:
+    """In-memory name index over one user directory sheet"""
+
+    def __init__(self, df, name_columns=NAME_COLUMNS, email_columns=EMAIL_COLUMNS, index=True):
+        df = df.rename(columns=lambda c: str(c).strip().lower())
+
+        self.name_col = _first_present(df.columns, name_columns)
+        self.email_col = _first_present(df.columns, email_columns)
+        self.df = df
+
+        # A one-off frame is scanned per lookup; building the index only pays off
+        # for the cached file-backed lookups that answer many queries
+        self.indexed = index
+        if not index:
+            return
+
+        # Lowercased name -> first matching row, built once per sheet
+        self._rows = df.to_dict('records')
+        self._exact = {}
+        # Sorted (suffix, row position) pairs: every substring of a name is
+        # a prefix of one of its suffixes, so partial matches are a bisect
+        self._suffixes = []
+        if self.name_col:
+            for pos, row in enumerate(self._rows):
+                value = row[self.name_col]
+                if isinstance(value, str):
+                    value = value.lower()
+                    self._exact.setdefault(value, row)
+                    self._suffixes.extend((value[i:], pos) for i in range(len(value)))
+            self._suffixes.sort()
+
+    def find_user(self, name, partial=True):
+        """Return the row dict for name (exact match first, then substring)"""
+        if not self.name_col:
+            return None
+
+        name_lower = name.lower()
+        if not self.indexed:
+            return self._scan(name_lower, partial)
+
+        row = self._exact.get(name_lower)
+        if row is not None or not partial:
+            return row
+
+        return self._find_partial(name_lower)
+
+    def _scan(self, name_lower, partial):
+        """Exact, then substring match over the unindexed frame; first row in file order"""
+        names = self.df[self.name_col].str.lower()
+        match = (names == name_lower).fillna(False)
+        if not match.any() and partial:
+            match = names.str.contains(name_lower, na=False, regex=False)
+        if not match.any():
+            return None
+        return self.df.loc[match.to_numpy(dtype=bool)].iloc[0].to_dict()
+
+    def _find_partial(self, name_lower):
+        """Return the first row (file order) whose name contains name_lower"""
+        first = None
+        for i in range(bisect_left(self._suffixes, (name_lower,)), len(self._suffixes)):
+            suffix, pos = self._suffixes[i]
+            if not suffix.startswith(name_lower):
+                break
+            if first is None or pos < first:
+                first = pos
+        return self._rows[first] if first is not None else None
+
+    def find_email(self, name, partial=True):
+        """Return the email for name, or None"""
+        if not self.email_col:
+            return None
+
+        row = self.find_user(name, partial)
+        return row[self.email_col] if row is not None else None
+
+
+@lru_cache(maxsize=4)
+def _load_xlsx(path_str, mtime_ns):
+    """Parsed directory sheet; mtime_ns keys the cache so an edited file is re-read"""
+    return read_excel(path_str)
+
+def _read_directory(path):
+    """Cached sheet for path, as a copy callers may modify"""
+    path = Path(path)
+    return _load_xlsx(str(path), path.stat().st_mtime_ns).copy()
+
+
+# (path, name_columns) -> (file mtime, UserLookup)
+_lookups = {}
+_lookups_lock = threading.Lock()
+
+def get_user_lookup(path=TEAM_FILE, name_columns=NAME_COLUMNS):
+    """Return the cached UserLookup for a directory file, rebuilt when the file changes"""
+    key = (str(path), tuple(name_columns))
+    mtime = Path(path).stat().st_mtime_ns
+    cached = _lookups.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _lookups_lock:
+        # Another thread may have rebuilt it while we waited
+        cached = _lookups.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, UserLookup(_load_xlsx(str(path), mtime), name_columns))
+            _lookups[key] = cached
+    return cached[1]
+
+def _warm_team_lookup():
+    try:
+        if TEAM_FILE.exists():
+            get_user_lookup(TEAM_FILE)
+    except Exception as e:
+        print(f"   ⚠️  Could not preload {TEAM_FILE.name}: {e}")
+
+# Build the team index in the background so the first lookup doesn't pay for it
+threading.Thread(target=_warm_team_lookup, daemon=True).start()
+
+def _team_lookup(team_df=None):
+    """UserLookup for the passed Team_Directory dataframe, else the cached file index"""
+    if team_df is not None:
+        return UserLookup(team_df, index=False)
+    if TEAM_FILE.exists():
+        return get_user_lookup(TEAM_FILE)
+    return None
+
 def find_user_email(name, team_df=None):
     """Find user email by name"""
     try:
         # Try users.xlsx first
         if USERS_FILE.exists():
-            df = pd.read_excel(USERS_FILE)
-            df.columns = df.columns.str.strip().str.lower()
-            
-            if 'name' in df.columns and 'email' in df.columns:
-                user = df[df['name'].str.lower() == name.lower()]
-                if not user.empty:
-                    return user.iloc[0]['email']
+            email = get_user_lookup(USERS_FILE, ['name']).find_email(name, partial=False)
+            if email is not None:
+                return email
         
-        # Try Team_Directory.xlsx - use passed dataframe or load it
-        if team_df is None and TEAM_FILE.exists():
-            team_df = pd.read_excel(TEAM_FILE)
-        
-        if team_df is not None:
-            # Normalize column names
-            team_df.columns = team_df.columns.str.strip().str.lower()
-            
-            # Try different name column combinations
-            name_cols = ['full_name', 'name', 'employee name', 'full name', 'username']
-            email_cols = ['email', 'email address', 'email_address', 'e-mail']
-            
-            name_col = None
-            email_col = None
-            
-            for col in name_cols:
-                if col in team_df.columns:
-                    name_col = col
-                    break
-            
-            for col in email_cols:
-                if col in team_df.columns:
-                    email_col = col
-                    break
-            
-            if name_col and email_col:
-                # Try exact match first
-                user = team_df[team_df[name_col].str.lower() == name.lower()]
-                if not user.empty:
-                    return user.iloc[0][email_col]
-                
-                # Try partial match
-                user = team_df[team_df[name_col].str.lower().str.contains(name.lower(), na=False)]
-                if not user.empty:
-                    return user.iloc[0][email_col]
-        
-        return None
+        # Try Team_Directory.xlsx - use passed dataframe or the cached index
+        lookup = _team_lookup(team_df)
+        return lookup.find_email(name) if lookup is not None else None
         
     except Exception as e:
         print(f"   ⚠️  Error finding email for {name}: {e}")
@@ -69,41 +173,14 @@ def find_user_info(name, team_df=None):
     try:
         # Try users.xlsx first
         if USERS_FILE.exists():
-            df = pd.read_excel(USERS_FILE)
-            df.columns = df.columns.str.strip().str.lower()
-            
-            if 'name' in df.columns:
-                user = df[df['name'].str.lower() == name.lower()]
-                if not user.empty:
-                    return user.iloc[0].to_dict()
-        
-        # Try Team_Directory
-        if team_df is None and TEAM_FILE.exists():
-            team_df = pd.read_excel(TEAM_FILE)
+            user = get_user_lookup(USERS_FILE, ['name']).find_user(name, partial=False)
+            if user is not None:
+                return dict(user)
         
-        if team_df is not None:
-            team_df.columns = team_df.columns.str.strip().str.lower()
-            
-            name_cols = ['full_name', 'name', 'employee name', 'full name', 'username']
-            name_col = None
-            
-            for col in name_cols:
-                if col in team_df.columns:
-                    name_col = col
-                    break
-            
-            if name_col:
-                # Try exact match
-                user = team_df[team_df[name_col].str.lower() == name.lower()]
-                if not user.empty:
-                    return user.iloc[0].to_dict()
-                
-                # Try partial match
-                user = team_df[team_df[name_col].str.lower().str.contains(name.lower(), na=False)]
-                if not user.empty:
-                    return user.iloc[0].to_dict()
-        
-        return None
+        # Try Team_Directory - exact match, then partial, from the same index
+        lookup = _team_lookup(team_df)
+        user = lookup.find_user(name) if lookup is not None else None
+        return dict(user) if user is not None else None
         
     except Exception as e:
         print(f"   ⚠️  Error finding user info for {name}: {e}")
@@ -113,13 +190,13 @@ def load_users_dataframe():
     """Load users from file"""
     try:
         if USERS_FILE.exists():
-            return pd.read_excel(USERS_FILE)
+            return _read_directory(USERS_FILE)
     except:
         pass
     
     try:
         if TEAM_FILE.exists():
-            return pd.read_excel(TEAM_FILE)
+            return _read_directory(TEAM_FILE)
     except:
         pass
     
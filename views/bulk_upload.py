@@ -12,7 +12,16 @@ import re
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-from utils.excel_handler import ExcelHandler
+from utils.excel_handler import ExcelHandler, read_excel, pyarrow
+
+# Free-text upload columns are read as text up front instead of being type-inferred
+UPLOAD_TEXT_DTYPES = {'Subject': str, 'Owner': str, 'Remarks': str, 'CC': str}
+
+def _text_column(df, col, default):
+    """df[col] as str values (default where missing), or default throughout if col is unmapped"""
+    if not col:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[col].map(str, na_action='ignore').fillna(default).astype(object)
 
 def show_bulk_upload():
     """Display the bulk upload page"""
@@ -87,9 +96,15 @@ def show_bulk_upload():
         
         try:
             if uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_file)
+                df = read_excel(uploaded_file, dtype=UPLOAD_TEXT_DTYPES)
             elif uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
+                # Arrow's multi-threaded parser when available; Due Date stays as typed
+                # rather than being inferred into timestamps
+                df = pd.read_csv(
+                    uploaded_file,
+                    dtype={**UPLOAD_TEXT_DTYPES, 'Due Date': str},
+                    engine='pyarrow' if pyarrow is not None else 'c'
+                )
             elif uploaded_file.name.endswith('.docx'):
                 st.warning("DOCX parsing requires python-docx. Please use Excel or CSV format.")
                 return
@@ -120,26 +135,24 @@ def show_bulk_upload():
                 st.warning("⚠️ Please select at least Subject and Owner columns")
                 return
             
-            # Convert to task list
-            for idx, row in df.iterrows():
-                task = {
-                    'Subject': str(row[subject_col]) if subject_col and pd.notna(row.get(subject_col)) else '',
-                    'Owner': str(row[owner_col]) if owner_col and pd.notna(row.get(owner_col)) else '',
-                    'Priority': str(row[priority_col]) if priority_col and pd.notna(row.get(priority_col)) else default_priority,
-                    'Status': default_status,
-                    'Due Date': str(row[due_date_col]) if due_date_col and pd.notna(row.get(due_date_col)) else '',
-                    'Remarks': str(row[remarks_col]) if remarks_col and pd.notna(row.get(remarks_col)) else '',
-                    'CC': str(row[cc_col]) if cc_col and pd.notna(row.get(cc_col)) else ''
-                }
-                
-                # Apply default due date
-                if not task['Due Date'] and use_default_due:
-                    due_date = datetime.now() + timedelta(days=default_due_days)
-                    task['Due Date'] = due_date.strftime('%d-%b-%Y')
-                
-                # Validate task
-                if task['Subject'] and task['Owner']:
-                    tasks_to_create.append(task)
+            # Convert to task list, a column at a time
+            out = pd.DataFrame({
+                'Subject': _text_column(df, subject_col, ''),
+                'Owner': _text_column(df, owner_col, ''),
+                'Priority': _text_column(df, priority_col, default_priority),
+                'Status': default_status,
+                'Due Date': _text_column(df, due_date_col, ''),
+                'Remarks': _text_column(df, remarks_col, ''),
+                'CC': _text_column(df, cc_col, '')
+            }, index=df.index)
+            
+            # Apply default due date
+            if use_default_due:
+                due_date = datetime.now() + timedelta(days=default_due_days)
+                out.loc[out['Due Date'].eq(''), 'Due Date'] = due_date.strftime('%d-%b-%Y')
+            
+            # Validate tasks
+            tasks_to_create = out[out['Subject'].ne('') & out['Owner'].ne('')].to_dict('records')
             
             # Show preview of mapped tasks
             if tasks_to_create:
@@ -170,15 +183,14 @@ def show_bulk_upload():
                     created_count = 0
                     created_tasks = []
                     
+                    # Generate Task IDs from one scan of today's existing IDs
+                    today = datetime.now()
+                    date_str = today.strftime('%Y%m%d')
+                    created_date = today.strftime('%d-%b-%Y')
+                    next_num = int(df_registry['Task ID'].astype(str).str.contains(date_str, na=False).sum()) + 1
+                    
                     for task_data in tasks_to_create:
                         try:
-                            # Generate Task ID
-                            today = datetime.now()
-                            date_str = today.strftime('%Y%m%d')
-                            
-                            # Find next available number for today
-                            existing_ids = df_registry[df_registry['Task ID'].str.contains(date_str, na=False)]['Task ID'].tolist()
-                            next_num = len(existing_ids) + 1
                             task_id = f"MAN-{date_str}-{next_num:03d}"
                             
                             # Create new task row
@@ -189,20 +201,23 @@ def show_bulk_upload():
                                 'Priority': task_data.get('Priority', default_priority),
                                 'Status': task_data.get('Status', default_status),
                                 'Due Date': task_data.get('Due Date', ''),
-                                'Created Date': today.strftime('%d-%b-%Y'),
+                                'Created Date': created_date,
                                 'Last Reminder Date': '',
                                 'Remarks': task_data.get('Remarks', ''),
                                 'CC': task_data.get('CC', '')
                             }
                             
-                            # Append to dataframe
-                            df_registry = pd.concat([df_registry, pd.DataFrame([new_task])], ignore_index=True)
                             created_tasks.append(new_task)
                             created_count += 1
+                            next_num += 1
                             
                         except Exception as e:
                             st.warning(f"⚠️ Skipped task: {task_data.get('Subject', 'Unknown')} - Error: {str(e)}")
                     
+                    # Append all new rows in one concat
+                    if created_tasks:
+                        df_registry = pd.concat([df_registry, pd.DataFrame(created_tasks)], ignore_index=True)
+                    
                     # Save updated registry
                     if created_count > 0:
                         excel_handler.write_data(df_registry)
@@ -9,7 +9,10 @@ Features:
 - Manager overview
 """
 
+import os
+from dataclasses import dataclass
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import date, datetime, timedelta
 from utils.task_normalizer import normalize_df
@@ -17,32 +20,56 @@ from utils.task_normalizer import normalize_df
 try:
     import plotly.express as px
     import plotly.graph_objects as go
+    import plotly.io as pio
 except ModuleNotFoundError:
     px = None
     go = None
+    pio = None
+
+# st.fragment (Streamlit 1.37+) reruns just the decorated section on its own
+# widget events; on older versions the section simply runs inline
+_fragment = getattr(st, "fragment", None) or (lambda func: func)
+
+PRIORITY_EMOJI = {
+    'URGENT': '🔴',
+    'HIGH': '🟠',
+    'MEDIUM': '🟡',
+    'LOW': '🟢'
+}
+
+STATUS_EMOJI = {
+    'OPEN': '📋',
+    'COMPLETED': '✅',
+    'DONE': '✅',
+    'BLOCKED': '🚨',
+    'IN PROGRESS': '🔄',
+    'DELETED': '🗑️'
+}
+
+# Chart colours, shared by every figure instead of rebuilt per chart
+PRIORITY_COLORS = {
+    'URGENT': '#FF4B4B',
+    'HIGH': '#FF8C00',
+    'MEDIUM': '#FFD700',
+    'LOW': '#90EE90'
+}
+
+STATUS_COLORS = {
+    'OPEN': '#FFA500',
+    'COMPLETED': '#90EE90',
+    'DONE': '#90EE90',
+    'BLOCKED': '#FF4B4B',
+    'IN PROGRESS': '#4169E1'
+}
 
 def get_priority_emoji(priority):
     """Get emoji for priority level"""
-    priority_map = {
-        'URGENT': '🔴',
-        'HIGH': '🟠',
-        'MEDIUM': '🟡',
-        'LOW': '🟢'
-    }
-    return priority_map.get(str(priority).upper(), '⚪')
+    return PRIORITY_EMOJI.get(str(priority).upper(), '⚪')
 
 
 def get_status_emoji(status):
     """Get emoji for status"""
-    status_map = {
-        'OPEN': '📋',
-        'COMPLETED': '✅',
-        'DONE': '✅',
-        'BLOCKED': '🚨',
-        'IN PROGRESS': '🔄',
-        'DELETED': '🗑️'
-    }
-    return status_map.get(str(status).upper(), '❓')
+    return STATUS_EMOJI.get(str(status).upper(), '❓')
 
 
 def calculate_completion_rate(df):
@@ -54,36 +81,72 @@ def calculate_completion_rate(df):
     return round((completed / total) * 100, 1)
 
 
+def _due_days(df):
+    """due_date as a numpy datetime64[D] array (NaT where missing), for int64 compares"""
+    return pd.to_datetime(df['due_date'], errors='coerce').to_numpy(dtype='datetime64[D]')
+
+
 def get_overdue_tasks(df, today):
     """Get overdue tasks"""
-    return df[
-        (df['status'] == 'OPEN') &
-        (df['due_date'].notna()) &
-        (df['due_date'] < today)
-    ]
+    # NaT compares False, so undated tasks drop out without a separate notna mask
+    due = _due_days(df)
+    return df[(df['status'] == 'OPEN').to_numpy(dtype=bool) & (due < np.datetime64(today, 'D'))]
 
 
 def get_due_soon_tasks(df, today, days=3):
     """Get tasks due within specified days"""
-    future_date = today + timedelta(days=days)
+    due = _due_days(df)
+    today_d = np.datetime64(today, 'D')
     return df[
-        (df['status'] == 'OPEN') &
-        (df['due_date'].notna()) &
-        (df['due_date'] >= today) &
-        (df['due_date'] <= future_date)
+        (df['status'] == 'OPEN').to_numpy(dtype=bool) &
+        (due >= today_d) &
+        (due <= today_d + days)
     ]
 
 
-def render_kpi_cards(df, today):
+@dataclass
+class TaskMasks:
+    """Boolean row masks over the dashboard frame, shared by every section"""
+    open: np.ndarray
+    done: np.ndarray
+    urgent: np.ndarray
+    blocked: np.ndarray
+    overdue: np.ndarray
+    due_today: np.ndarray
+    due_this_week: np.ndarray
+
+
+def compute_task_masks(df, today):
+    """Scan status, priority and due date once per render instead of once per section"""
+    status = df['status']
+    is_open = (status == 'OPEN').to_numpy(dtype=bool)
+    # NaT compares False, so undated tasks are never overdue or due
+    due = _due_days(df)
+    today_d = np.datetime64(today, 'D')
+    return TaskMasks(
+        open=is_open,
+        done=status.isin(['DONE', 'COMPLETED']).to_numpy(dtype=bool),
+        urgent=(df['priority'] == 'URGENT').to_numpy(dtype=bool),
+        blocked=(status == 'BLOCKED').to_numpy(dtype=bool),
+        overdue=is_open & (due < today_d),
+        due_today=is_open & (due == today_d),
+        due_this_week=is_open & (due >= today_d) & (due <= today_d + 7),
+    )
+
+
+def render_kpi_cards(df, today, masks):
     """Render KPI metric cards"""
     total = len(df)
-    open_count = len(df[df['status'] == 'OPEN'])
-    completed_count = len(df[df['status'].isin(['DONE', 'COMPLETED'])])
-    overdue = get_overdue_tasks(df, today)
-    due_today = df[(df['status'] == 'OPEN') & (df['due_date'] == today)]
-    due_this_week = get_due_soon_tasks(df, today, days=7)
     
-    completion_rate = calculate_completion_rate(df)
+    open_count = int(masks.open.sum())
+    completed_count = int(masks.done.sum())
+    blocked_count = int(masks.blocked.sum())
+    urgent_count = int(masks.urgent.sum())
+    completion_rate = round((completed_count / total) * 100, 1) if total else 0
+    
+    overdue_count = int(masks.overdue.sum())
+    due_today_count = int(masks.due_today.sum())
+    due_this_week_count = int(masks.due_this_week.sum())
     
     # KPI Row 1
     col1, col2, col3, col4 = st.columns(4)
@@ -115,9 +178,9 @@ def render_kpi_cards(df, today):
     with col4:
         st.metric(
             label="⚠️ Overdue",
-            value=len(overdue),
-            delta=f"{len(due_today)} due today" if len(due_today) > 0 else "0 due today",
-            delta_color="off" if len(overdue) == 0 else "inverse",
+            value=overdue_count,
+            delta=f"{due_today_count} due today",
+            delta_color="off" if overdue_count == 0 else "inverse",
             help="Tasks past their deadline"
         )
     
@@ -125,7 +188,6 @@ def render_kpi_cards(df, today):
     col5, col6, col7, col8 = st.columns(4)
     
     with col5:
-        urgent_count = len(df[df['priority'] == 'URGENT'])
         st.metric(
             label="🔴 Urgent Tasks",
             value=urgent_count,
@@ -133,7 +195,6 @@ def render_kpi_cards(df, today):
         )
     
     with col6:
-        blocked_count = len(df[df['status'] == 'BLOCKED'])
         st.metric(
             label="🚨 Blocked",
             value=blocked_count,
@@ -145,12 +206,12 @@ def render_kpi_cards(df, today):
     with col7:
         st.metric(
             label="📅 Due This Week",
-            value=len(due_this_week),
+            value=due_this_week_count,
             help="Tasks due within 7 days"
         )
     
     with col8:
-        avg_days = calculate_avg_completion_time(df)
+        avg_days = calculate_avg_completion_time(df[masks.done])
         st.metric(
             label="⏱️ Avg. Completion",
             value=f"{avg_days} days" if avg_days else "N/A",
@@ -158,43 +219,36 @@ def render_kpi_cards(df, today):
         )
 
 
-def calculate_avg_completion_time(df):
-    """Calculate average completion time"""
-    completed = df[df['status'].isin(['DONE', 'COMPLETED'])].copy()
+def calculate_avg_completion_time(completed):
+    """Calculate average completion time over already-completed tasks"""
     if completed.empty:
         return None
     
     # Try to calculate from created_on and completed date
     if 'created_on' in completed.columns and 'completed_date' in completed.columns:
-        completed['created_on'] = pd.to_datetime(completed['created_on'], errors='coerce')
-        completed['completed_date'] = pd.to_datetime(completed['completed_date'], errors='coerce')
-        completed['days_to_complete'] = (completed['completed_date'] - completed['created_on']).dt.days
-        avg = completed['days_to_complete'].mean()
-        if pd.notna(avg):
-            return round(avg, 1)
+        # normalize_df leaves both as YYYY-MM-DD, so whole-day arrays give exact day counts
+        created_on = pd.to_datetime(completed['created_on'], errors='coerce').to_numpy(dtype='datetime64[D]')
+        completed_date = pd.to_datetime(completed['completed_date'], errors='coerce').to_numpy(dtype='datetime64[D]')
+        days = completed_date - created_on
+        days = days[~np.isnat(days)].astype(np.int64)
+        if len(days):
+            return round(days.mean(), 1)
     
     return None
 
 
-def render_priority_breakdown(df):
-    """Render priority breakdown chart"""
-    st.subheader("🎯 Tasks by Priority")
-    
-    priority_order = ['URGENT', 'HIGH', 'MEDIUM', 'LOW']
-    priority_counts = df['priority'].value_counts().reindex(priority_order, fill_value=0)
-    
-    # Create interactive bar chart
+# Chart builders below are cached on their small aggregated inputs and return
+# the figure's JSON, so reruns with unchanged counts skip building/encoding it
+@st.cache_data(max_entries=16, show_spinner=False)
+def _priority_bar_json(priority_counts):
+    """Priority bar chart JSON for a tuple of (priority, count) pairs"""
+    priorities = [p for p, _ in priority_counts]
     fig = px.bar(
-        x=priority_counts.index,
-        y=priority_counts.values,
+        x=priorities,
+        y=[c for _, c in priority_counts],
         labels={'x': 'Priority', 'y': 'Number of Tasks'},
-        color=priority_counts.index,
-        color_discrete_map={
-            'URGENT': '#FF4B4B',
-            'HIGH': '#FF8C00',
-            'MEDIUM': '#FFD700',
-            'LOW': '#90EE90'
-        }
+        color=priorities,
+        color_discrete_map=PRIORITY_COLORS
     )
     
     fig.update_layout(
@@ -204,7 +258,22 @@ def render_priority_breakdown(df):
         yaxis_title="Task Count"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_json()
+
+def render_priority_breakdown(df):
+    """Render priority breakdown chart"""
+    st.subheader("🎯 Tasks by Priority")
+    
+    priority_order = ['URGENT', 'HIGH', 'MEDIUM', 'LOW']
+    priority_counts = df['priority'].value_counts().reindex(priority_order, fill_value=0)
+    
+    # Create interactive bar chart
+    if px is None:
+        st.warning("Plotly not installed. Showing basic chart.")
+        st.bar_chart(priority_counts)
+    else:
+        fig_json = _priority_bar_json(tuple((p, int(c)) for p, c in priority_counts.items()))
+        st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
     
     # Priority details
     col1, col2 = st.columns(2)
@@ -216,62 +285,49 @@ def render_priority_breakdown(df):
             percentage = (count / len(df) * 100) if len(df) > 0 else 0
             st.write(f"{emoji} **{priority}**: {count} ({percentage:.1f}%)")
 
-        if px is None:
-            st.warning("Plotly not installed. Showing basic chart.")
-            st.bar_chart(status_counts)
-            return
-
-def render_status_breakdown(df):
-    """Render status breakdown"""
-    st.subheader("📊 Task Status Overview")
-
-    status_counts = df['status'].value_counts()
-
+@st.cache_data(max_entries=16, show_spinner=False)
+def _status_pie_json(status_counts):
+    """Status pie chart JSON for a tuple of (status, count) pairs"""
+    statuses = [s for s, _ in status_counts]
     fig = px.pie(
-        values=status_counts.values,
-        names=status_counts.index,
-        color=status_counts.index,
-        color_discrete_map={
-            'OPEN': '#FFA500',
-            'COMPLETED': '#90EE90',
-            'DONE': '#90EE90',
-            'BLOCKED': '#FF4B4B',
-            'IN PROGRESS': '#4169E1'
-        }
+        values=[c for _, c in status_counts],
+        names=statuses,
+        color=statuses,
+        color_discrete_map=STATUS_COLORS
     )
 
     fig.update_traces(textposition='inside', textinfo='percent+label')
     fig.update_layout(height=400)
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_json()
+
+def render_status_breakdown(df):
+    """Render status breakdown"""
+    st.subheader("📊 Task Status Overview")
+
+    # Categorical counts list every category; keep only statuses actually present
+    status_counts = df['status'].value_counts()
+    status_counts = status_counts[status_counts > 0]
 
     if px is None:
         st.warning("Plotly not installed. Showing basic chart.")
         st.bar_chart(status_counts)
         return
 
-def render_owner_workload(df):
-    """Render owner workload analysis"""
-    st.subheader("👥 Team Workload Distribution")
-    
-    owner_status = df.groupby(['owner', 'status']).size().unstack(fill_value=0)
-    
-    # Stacked bar chart
+    fig_json = _status_pie_json(tuple((s, int(c)) for s, c in status_counts.items()))
+    st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _owner_workload_json(owner_status):
+    """Stacked owner/status bar chart JSON for an owner x status count table"""
     fig = go.Figure()
     
-    colors = {
-        'OPEN': '#FFA500',
-        'COMPLETED': '#90EE90',
-        'DONE': '#90EE90',
-        'BLOCKED': '#FF4B4B'
-    }
-    
     for status in owner_status.columns:
         fig.add_trace(go.Bar(
             name=status,
             x=owner_status.index,
             y=owner_status[status],
-            marker_color=colors.get(status, '#808080')
+            marker_color=STATUS_COLORS.get(status, '#808080')
         ))
     
     fig.update_layout(
@@ -282,29 +338,61 @@ def render_owner_workload(df):
         legend_title="Status"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_json()
+
+def render_owner_workload(df):
+    """Render owner workload analysis"""
+    st.subheader("👥 Team Workload Distribution")
+    
+    owner_status = df.groupby(['owner', 'status'], observed=True).size().unstack(fill_value=0)
+    
+    # Stacked bar chart
+    if go is None:
+        st.warning("Plotly not installed. Showing basic chart.")
+        st.bar_chart(owner_status)
+    else:
+        fig_json = _owner_workload_json(owner_status)
+        st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
     
     # Workload table
     st.markdown("**Individual Workload:**")
-    workload_summary = df.groupby('owner').agg({
-        'status': lambda x: (x == 'OPEN').sum(),
-        'priority': lambda x: (x == 'URGENT').sum()
-    }).rename(columns={'status': 'Open Tasks', 'priority': 'Urgent Tasks'})
-    
-    workload_summary = workload_summary.sort_values('Open Tasks', ascending=False)
+    # Boolean flags summed per owner in one groupby, not a Python lambda per group;
+    # unsorted groups, since the table is ordered by open count below anyway
+    workload_summary = pd.DataFrame({
+        'Open Tasks': df['status'].eq('OPEN'),
+        'Urgent Tasks': df['priority'].eq('URGENT')
+    }).groupby(df['owner'], sort=False, observed=True).sum()
+    
+    workload_summary = workload_summary.sort_values('Open Tasks', ascending=False, kind='stable')
     st.dataframe(workload_summary, use_container_width=True)     
 
+# Above this many dated tasks the timeline plots one mark per owner/day/priority
+TIMELINE_MAX_ROWS = 5000
+
 def render_timeline_view(df, today):
     """Render timeline of tasks"""
     st.subheader("📅 Task Timeline")
     
-    df_timeline = df[df['due_date'].notna()].copy()
+    df_timeline = df[df['due_date'].notna()]
     
     if df_timeline.empty:
         st.info("No tasks with due dates to display.")
         return
     
-    df_timeline['status_display'] = df_timeline['status'].apply(lambda x: get_status_emoji(x) + ' ' + x)
+    if px is None:
+        st.warning("Plotly not installed. Timeline chart unavailable.")
+        return
+    
+    hover_data = ['subject', 'status']
+    if len(df_timeline) > TIMELINE_MAX_ROWS:
+        # Tasks sharing owner, day and priority draw the same mark; send one
+        # row per mark to the browser instead of every task. dropna=False keeps
+        # tasks without an owner, as the unaggregated chart does
+        df_timeline = (
+            df_timeline.groupby(['owner', 'due_date', 'priority'], observed=True, dropna=False)
+            .size().rename('tasks').reset_index()
+        )
+        hover_data = ['tasks']
     
     # Timeline chart
     fig = px.timeline(
@@ -313,73 +401,60 @@ def render_timeline_view(df, today):
         x_end='due_date',
         y='owner',
         color='priority',
-        hover_data=['subject', 'status'],
-        color_discrete_map={
-            'URGENT': '#FF4B4B',
-            'HIGH': '#FF8C00',
-            'MEDIUM': '#FFD700',
-            'LOW': '#90EE90'
-        }
+        hover_data=hover_data,
+        color_discrete_map=PRIORITY_COLORS
     )
     
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
 
-def render_overdue_alerts(df, today):
+def _alert_table(tasks):
+    """Subject/owner/priority columns shared by the overdue and upcoming tables"""
+    # Priorities are already upper-cased, so a plain dict map replaces the per-row helper
+    priority = tasks['priority'].astype(object)
+    return pd.DataFrame({
+        "Task": tasks['subject'].fillna('No subject'),
+        "Owner": tasks['owner'].fillna('Unknown'),
+        "Priority": priority.map(PRIORITY_EMOJI).fillna('⚪') + " " + priority.map(str),
+    })
+
+def render_overdue_alerts(df, today, masks):
     """Render overdue tasks alert"""
-    overdue = get_overdue_tasks(df, today)
+    overdue = df[masks.overdue]
     
     if not overdue.empty:
         st.error(f"🚨 **{len(overdue)} Overdue Tasks Require Immediate Attention!**")
         
         with st.expander("📋 View Overdue Tasks", expanded=True):
-            for idx, task in overdue.iterrows():
-                days_overdue = (today - task['due_date']).days
-                priority_emoji = get_priority_emoji(task['priority'])
-                
-                col1, col2, col3 = st.columns([3, 1, 1])
-                with col1:
-                    st.markdown(f"**{task.get('subject', 'No subject')}**")
-                    st.caption(f"Owner: {task.get('owner', 'Unknown')}")
-                with col2:
-                    st.markdown(f"{priority_emoji} {task['priority']}")
-                with col3:
-                    st.markdown(f"⏰ **{days_overdue}** days overdue")
-                
-                st.divider()
-
-
-def render_upcoming_tasks(df, today):
+            # One table widget for all rows instead of columns/markdown per task
+            days_overdue = (pd.Timestamp(today) - overdue['due_date']).dt.days
+            st.dataframe(
+                _alert_table(overdue).assign(**{"⏰ Days Overdue": days_overdue}),
+                use_container_width=True,
+                hide_index=True
+            )
+
+
+def render_upcoming_tasks(df, today, masks):
     """Render upcoming tasks"""
-    due_soon = get_due_soon_tasks(df, today, days=7)
+    due_soon = df[masks.due_this_week]
     
     if not due_soon.empty:
         st.warning(f"📅 **{len(due_soon)} Tasks Due This Week**")
         
         with st.expander("📋 View Upcoming Tasks", expanded=False):
             due_soon_sorted = due_soon.sort_values('due_date')
-            for idx, task in due_soon_sorted.iterrows():
-                days_remaining = (task['due_date'] - today).days
-                priority_emoji = get_priority_emoji(task['priority'])
-                
-                col1, col2, col3 = st.columns([3, 1, 1])
-                with col1:
-                    st.markdown(f"**{task.get('subject', 'No subject')}**")
-                    st.caption(f"Owner: {task.get('owner', 'Unknown')}")
-                with col2:
-                    st.markdown(f"{priority_emoji} {task['priority']}")
-                with col3:
-                    if days_remaining == 0:
-                        st.markdown("📅 **Today**")
-                    elif days_remaining == 1:
-                        st.markdown("📅 **Tomorrow**")
-                    else:
-                        st.markdown(f"📅 **{days_remaining}** days")
-                
-                st.divider()
-
-
-def render_performance_insights(df):
+            days_remaining = (due_soon_sorted['due_date'] - pd.Timestamp(today)).dt.days
+            due_label = days_remaining.astype(str) + " days"
+            due_label = due_label.mask(days_remaining == 0, "Today").mask(days_remaining == 1, "Tomorrow")
+            st.dataframe(
+                _alert_table(due_soon_sorted).assign(**{"📅 Due": due_label}),
+                use_container_width=True,
+                hide_index=True
+            )
+
+
+def render_performance_insights(df, masks):
     """Render performance insights"""
     st.subheader("📈 Performance Insights")
     
@@ -387,18 +462,20 @@ def render_performance_insights(df):
     
     with col1:
         st.markdown("**🎯 Completion Rate by Priority:**")
+        # Completed and total per priority from a single groupby
+        is_done = pd.Series(masks.done, index=df.index)
+        by_priority = is_done.groupby(df['priority'], observed=True).agg(['sum', 'size'])
         for priority in ['URGENT', 'HIGH', 'MEDIUM', 'LOW']:
-            priority_tasks = df[df['priority'] == priority]
-            if not priority_tasks.empty:
-                completed = len(priority_tasks[priority_tasks['status'].isin(['DONE', 'COMPLETED'])])
-                total = len(priority_tasks)
+            if priority in by_priority.index and by_priority.at[priority, 'size'] > 0:
+                completed = int(by_priority.at[priority, 'sum'])
+                total = int(by_priority.at[priority, 'size'])
                 rate = (completed / total * 100) if total > 0 else 0
                 emoji = get_priority_emoji(priority)
                 st.progress(rate / 100, text=f"{emoji} {priority}: {rate:.1f}% ({completed}/{total})")
     
     with col2:
         st.markdown("**👥 Top Performers:**")
-        completed_by_owner = df[df['status'].isin(['DONE', 'COMPLETED'])].groupby('owner').size().sort_values(ascending=False)
+        completed_by_owner = df.loc[masks.done, 'owner'].value_counts()
         
         if not completed_by_owner.empty:
             for i, (owner, count) in enumerate(completed_by_owner.head(5).items(), 1):
@@ -408,58 +485,90 @@ def render_performance_insights(df):
             st.info("No completed tasks yet.")
 
 
-def render_dashboard(excel_handler):
-    """Main dashboard rendering function"""
-    st.title("📊 Dashboard Analytics")
-    
-    # Load and prepare data
-    df = excel_handler.load_data()
-    df = normalize_df(df)
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def _load_prepared_df(_excel_handler, path, stamp):
+    """
+    Registry frame prepared for the dashboard, with DELETED tasks dropped;
+    None if there are no tasks at all. path and the file's (mtime_ns, size)
+    stamp key the cache, so an edited file is re-read and normalized while
+    reruns in between reuse the prepared frame without hashing any data.
+    """
+    # load_data() already hands back a private copy, so normalize it in place
+    df = _excel_handler.load_data()
+    df = normalize_df(df, copy=False)
     
     if df.empty:
-        st.info("📭 No tasks available for analytics.")
-        st.markdown("""
-        ### Getting Started
-        1. Create tasks via **✍️ Manual Entry**
-        2. Upload MOM files via **📂 Bulk MOM Upload**
-        3. Come back here to view analytics
-        """)
-        return
-    
-    # Data preparation
-    df = df.copy()
-    df.columns = df.columns.str.strip().str.lower()
+        return None
     
-    # Normalize column names
+    # Data preparation: lower-case and normalize column names in one rename
     rename_map = {
         "task_text": "subject",
         "due date": "due_date",
         "deadline": "due_date",
+        "created on": "created_on",
+        "completed date": "completed_date",
     }
-    df.rename(columns={c: rename_map.get(c, c) for c in df.columns}, inplace=True)
+    
+    def dashboard_column(c):
+        c = str(c).strip().lower()
+        return rename_map.get(c, c)
+    
+    df.rename(columns=dashboard_column, inplace=True)
     
     # Ensure required columns exist
     for col in ["subject", "owner", "priority", "status", "due_date"]:
         if col not in df.columns:
             df[col] = None
     
-    # Normalize status
-    df["status"] = df["status"].astype(str).str.upper().str.strip()
+    # Normalize status (normalize_df's categorical column is already canonical);
+    # either way it ends up categorical, so compares and groupbys run on int codes
+    if not isinstance(df["status"].dtype, pd.CategoricalDtype):
+        df["status"] = df["status"].astype(str).str.upper().str.strip().astype("category")
     
     # Filter out deleted tasks
     df = df[df["status"] != "DELETED"]
     
+    # Convert due_date to datetime; kept as datetime64 (midnight) rather than python
+    # date objects, so the date compares below stay vectorized
+    df["due_date"] = pd.to_datetime(df["due_date"], errors="coerce").dt.normalize()
+    
+    # Normalize priority
+    if not isinstance(df["priority"].dtype, pd.CategoricalDtype):
+        df["priority"] = df["priority"].astype(str).str.upper().str.strip()
+        df["priority"] = df["priority"].replace({'NAN': 'MEDIUM', '': 'MEDIUM'}).astype("category")
+    
+    return df
+
+
+def render_dashboard(excel_handler):
+    """Main dashboard rendering function"""
+    st.title("📊 Dashboard Analytics")
+    
+    # Load and prepare data (cached until the registry file changes). Deferred
+    # writes are saved first, so the file stamp covers every edit made so far
+    excel_handler.flush()
+    path = excel_handler.excel_path
+    try:
+        file_stat = os.stat(path)
+        stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        stamp = None
+    df = _load_prepared_df(excel_handler, path, stamp)
+    
+    if df is None:
+        st.info("📭 No tasks available for analytics.")
+        st.markdown("""
+        ### Getting Started
+        1. Create tasks via **✍️ Manual Entry**
+        2. Upload MOM files via **📂 Bulk MOM Upload**
+        3. Come back here to view analytics
+        """)
+        return
+    
     if df.empty:
         st.warning("⚠️ No active tasks to analyze (all tasks are deleted).")
         return
     
-    # Convert due_date to datetime
-    df["due_date"] = pd.to_datetime(df["due_date"], errors="coerce").dt.date
-    
-    # Normalize priority
-    df["priority"] = df["priority"].astype(str).str.upper().str.strip()
-    df["priority"] = df["priority"].replace({'NAN': 'MEDIUM', '': 'MEDIUM'})
-    
     today = date.today()
     
     # Date filter in sidebar
@@ -472,29 +581,33 @@ def render_dashboard(excel_handler):
         index=0
     )
     
+    start_date = end_date = None
     if date_filter == "This Week":
         start_date = today - timedelta(days=today.weekday())
         end_date = start_date + timedelta(days=6)
-        df = df[(df['due_date'] >= start_date) & (df['due_date'] <= end_date)]
+        due = _due_days(df)
+        df = df[(due >= np.datetime64(start_date, 'D')) & (due <= np.datetime64(end_date, 'D'))]
     elif date_filter == "This Month":
         start_date = today.replace(day=1)
-        df = df[df['due_date'] >= start_date]
+        df = df[_due_days(df) >= np.datetime64(start_date, 'D')]
     elif date_filter == "Custom":
         col1, col2 = st.sidebar.columns(2)
         with col1:
             start_date = st.date_input("From:", today - timedelta(days=30))
         with col2:
             end_date = st.date_input("To:", today)
-        df = df[(df['due_date'] >= start_date) & (df['due_date'] <= end_date)]
+        due = _due_days(df)
+        df = df[(due >= np.datetime64(start_date, 'D')) & (due <= np.datetime64(end_date, 'D'))]
     
     # Render dashboard sections
-    render_kpi_cards(df, today)
+    masks = compute_task_masks(df, today)
+    render_kpi_cards(df, today, masks)
     
     st.divider()
     
     # Alerts section
-    render_overdue_alerts(df, today)
-    render_upcoming_tasks(df, today)
+    render_overdue_alerts(df, today, masks)
+    render_upcoming_tasks(df, today, masks)
     
     st.divider()
     
@@ -513,23 +626,40 @@ def render_dashboard(excel_handler):
     
     st.divider()
     
-    render_performance_insights(df)
+    render_performance_insights(df, masks)
     
     st.divider()
     
     render_timeline_view(df, today)
     
-    # Export section
+    # The filtered frame is fully determined by the registry stamp and the date range
+    export_key = (path, stamp, start_date, end_date)
+    _render_export_section(df, excel_handler, today, export_key)
+    
+    # Footer
+    st.divider()
+    st.caption(f"📊 Dashboard last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    st.caption(f"📈 Showing {len(df)} active tasks")
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _csv_bytes(_df, export_key):
+    """CSV download payload, cached on export_key so reruns neither re-format nor hash the frame"""
+    return _df.to_csv(index=False).encode('utf-8')
+
+
+@_fragment
+def _render_export_section(df, excel_handler, today, export_key):
+    """Export buttons; pressing one reruns only this section, not every chart above"""
     st.divider()
     st.subheader("📥 Export Data")
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        csv = df.to_csv(index=False).encode('utf-8')
         st.download_button(
             label="📄 Download CSV",
-            data=csv,
+            data=_csv_bytes(df, export_key),
             file_name=f"task_analytics_{today}.csv",
             mime="text/csv"
         )
@@ -538,7 +668,12 @@ def render_dashboard(excel_handler):
         if st.button("🔄 Refresh Data"):
             st.rerun()
     
-    # Footer
-    st.divider()
-    st.caption(f"📊 Dashboard last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    st.caption(f"📈 Showing {len(df)} active tasks")
+    with col3:
+        # Built only on request; the full registry export isn't needed on every render
+        if st.button("📊 Prepare Excel Export"):
+            st.download_button(
+                label="📥 Download Task Registry (Excel)",
+                data=excel_handler.export_xlsx(),
+                file_name=f"tasks_registry_{today}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
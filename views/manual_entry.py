@@ -39,23 +39,9 @@ def render_manual_entry(excel_handler):
                 st.warning("⚠️ Please enter Task Subject/Title")
                 return
 
-            # ✅ Generate unique task_id
+            # ✅ Generate unique task_id (sidecar counter, no registry reload)
             today = datetime.now()
-            task_id_prefix = f"MAN-{today.strftime('%Y%m%d')}"
-            
-            # Load existing tasks to get next sequence number
-            df = excel_handler.load_data()
-            
-            # Find existing manual tasks for today
-            if len(df) > 0 and 'task_id' in df.columns:
-                today_manual_tasks = df[
-                    df['task_id'].astype(str).str.startswith(task_id_prefix, na=False)
-                ]
-                next_seq = len(today_manual_tasks) + 1
-            else:
-                next_seq = 1
-            
-            task_id = f"{task_id_prefix}-{next_seq:03d}"
+            task_id = excel_handler.next_manual_task_id(today)
             
             # ✅ Generate meeting_id for manual tasks
             meeting_id = f"MANUAL-{today.strftime('%Y%m%d')}"
@@ -80,7 +66,7 @@ def render_manual_entry(excel_handler):
                     "Auto Reply Sent": None
                 }
                 
-                # Append to Excel
+                # Append to Excel (single row appended in place)
                 total = excel_handler.append_rows([new_task])
                 
                 st.success(f"✅ Task created successfully!")
@@ -101,4 +87,4 @@ def render_manual_entry(excel_handler):
                 with st.expander("🔍 Debug Information"):
                     st.write("**Error Details:**", str(e))
                     st.write("**Task Data:**", new_task)
-                    st.write("**Excel Columns:**", list(excel_handler.load_data().columns))
+                    st.write("**Excel Columns:**", excel_handler.required_columns)
@@ -6,12 +6,159 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 import os
+import getpass
+import smtplib
+import subprocess
+import threading
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
+from utils.excel_handler import read_excel, read_parquet_mirror
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Settings shown or used on this page
+ENV_KEYS = [
+    "SMTP_SERVER",
+    "SMTP_PORT",
+    "SMTP_USERNAME",
+    "CEO_AGENT_EMAIL_PASSWORD",
+    "AGENT_SENDER_NAME",
+    "AGENT_SENDER_EMAIL",
+]
+
+@st.cache_resource
+def _env_settings():
+    """Load .env once per process and snapshot the settings this page reads"""
+    # load_dotenv never overrides variables already set, so re-parsing .env on
+    # every rerun could not change these values anyway
+    load_dotenv(BASE_DIR / '.env')
+    return {key: os.environ[key] for key in ENV_KEYS if key in os.environ}
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_xlsx(path: str, mtime_ns: int) -> pd.DataFrame:
+    """Parsed sheet; mtime_ns keys the cache so the file is re-read only after it changes"""
+    return read_excel(path)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_registry(path: str, mtime_ns: int) -> pd.DataFrame:
+    """Task registry, from ExcelHandler's parquet mirror when it is current, else the xlsx"""
+    df = read_parquet_mirror(path, mtime_ns)
+    return df if df is not None else read_excel(path)
+
+TEAM_FILE = BASE_DIR / "data" / "Team_Directory.xlsx"
+REGISTRY_FILE = BASE_DIR / "data" / "tasks_registry.xlsx"
+LOGS_DIR = BASE_DIR / "logs"
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _fs_snapshot():
+    """mtime_ns of each file/dir this page checks (None if missing), stat'ed once per 5 seconds"""
+    snapshot = {}
+    for key, path in (("team", TEAM_FILE), ("registry", REGISTRY_FILE), ("logs", LOGS_DIR)):
+        try:
+            snapshot[key] = path.stat().st_mtime_ns
+        except OSError:
+            snapshot[key] = None
+    return snapshot
+
+# Per-user crontab spool files (Debian/Ubuntu, then RHEL-style layout)
+CRONTAB_SPOOL_DIRS = [Path("/var/spool/cron/crontabs"), Path("/var/spool/cron")]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _crontab_text():
+    """The user's crontab text, or None if it can't be read; re-checked at most once a minute"""
+    # Reading the spool file directly avoids forking `crontab -l`, but it is
+    # usually only readable by root
+    try:
+        user = getpass.getuser()
+        for spool_dir in CRONTAB_SPOOL_DIRS:
+            try:
+                return (spool_dir / user).read_text()
+            except OSError:
+                continue
+    except (OSError, KeyError):
+        pass
+
+    try:
+        return subprocess.run(['crontab', '-l'], capture_output=True, text=True).stdout
+    except Exception:
+        return None
+
+TEST_EMAIL_SUBJECT = "Test Email - Follow-up & Reminder Team"
+TEST_EMAIL_BODY = """
+<html>
+<body>
+    <h2>✅ Test Email Successful!</h2>
+    <p>This is a test email from your Follow-up & Reminder Team system.</p>
+    <p>If you received this email, your email configuration is working correctly.</p>
+    <hr>
+    <p style="color: #666; font-size: 12px;">© 2026 Koenig Solutions</p>
+</body>
+</html>
+"""
+
+# One logged-in SMTP connection is shared by repeated test sends, keyed by its
+# settings; the lock keeps concurrent sessions from interleaving commands on it
+_SMTP_LOCK = threading.Lock()
+_smtp = {"key": None, "conn": None}
+
+def _close_smtp():
+    """QUIT and drop the shared connection, if any; the caller holds _SMTP_LOCK"""
+    conn = _smtp["conn"]
+    _smtp["key"] = _smtp["conn"] = None
+    if conn is not None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+def _smtp_connection(server: str, port: int, username: str, password: str):
+    """The shared connection if it still answers NOOP, else a new one after STARTTLS and login"""
+    key = (server, port, username)
+    conn = _smtp["conn"]
+    if conn is not None and _smtp["key"] == key:
+        try:
+            # Servers drop idle sessions; a stale one answers 421 or not at all
+            if conn.noop()[0] == 250:
+                return conn
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    _close_smtp()
+    conn = smtplib.SMTP(server, port, timeout=30)
+    try:
+        conn.starttls()
+        conn.login(username, password)
+    except Exception:
+        conn.close()
+        raise
+    _smtp["key"], _smtp["conn"] = key, conn
+    return conn
+
+def _send_test_email(server, port, username, password, to_addr):
+    """Send the test email, reconnecting once if the shared connection fails mid-send"""
+    msg = MIMEMultipart()
+    msg['From'] = username
+    msg['To'] = to_addr
+    msg['Subject'] = TEST_EMAIL_SUBJECT
+    msg.attach(MIMEText(TEST_EMAIL_BODY, 'html'))
+    payload = msg.as_string()
+
+    with _SMTP_LOCK:
+        try:
+            _smtp_connection(server, port, username, password).sendmail(username, to_addr, payload)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, ConnectionError, TimeoutError) as e:
+            # Only a dropped session is retried, e.g. a 421 "closing connection" reply
+            # to MAIL FROM; auth failures and rejected messages are reported as they are
+            if isinstance(e, smtplib.SMTPResponseException) and e.smtp_code != 421:
+                raise
+            _close_smtp()
+            _smtp_connection(server, port, username, password).sendmail(username, to_addr, payload)
 
 def render_settings():
     """Render the settings page"""
     
-    BASE_DIR = Path(__file__).resolve().parent.parent
+    env = _env_settings()
     
     st.header("⚙️ System Settings")
     st.markdown("Configure and manage your Follow-up & Reminder Team system")
@@ -27,26 +174,23 @@ def render_settings():
     with tab1:
         st.subheader("📧 Email Configuration")
         
-        # Load current settings
-        load_dotenv(BASE_DIR / '.env')
-        
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### SMTP Settings")
-            smtp_server = st.text_input("SMTP Server", value=os.getenv('SMTP_SERVER', 'smtp.office365.com'), disabled=True)
-            smtp_port = st.text_input("SMTP Port", value=os.getenv('SMTP_PORT', '587'), disabled=True)
-            smtp_user = st.text_input("SMTP Username", value=os.getenv('SMTP_USERNAME', ''), disabled=True)
+            smtp_server = st.text_input("SMTP Server", value=env.get('SMTP_SERVER', 'smtp.office365.com'), disabled=True)
+            smtp_port = st.text_input("SMTP Port", value=env.get('SMTP_PORT', '587'), disabled=True)
+            smtp_user = st.text_input("SMTP Username", value=env.get('SMTP_USERNAME', ''), disabled=True)
             
             st.info("💡 To change email settings, edit the `.env` file in the project root")
         
         with col2:
             st.markdown("### Email Identity")
-            sender_name = st.text_input("Sender Name", value=os.getenv('AGENT_SENDER_NAME', 'Follow-up Team'), disabled=True)
-            sender_email = st.text_input("Sender Email", value=os.getenv('AGENT_SENDER_EMAIL', ''), disabled=True)
+            sender_name = st.text_input("Sender Name", value=env.get('AGENT_SENDER_NAME', 'Follow-up Team'), disabled=True)
+            sender_email = st.text_input("Sender Email", value=env.get('AGENT_SENDER_EMAIL', ''), disabled=True)
             
             st.markdown("### Status")
-            if os.getenv('SMTP_USERNAME') and os.getenv('CEO_AGENT_EMAIL_PASSWORD'):
+            if env.get('SMTP_USERNAME') and env.get('CEO_AGENT_EMAIL_PASSWORD'):
                 st.success("✅ Email configuration is complete")
             else:
                 st.error("❌ Email credentials missing in .env file")
@@ -62,39 +206,13 @@ def render_settings():
                 if test_email and '@' in test_email:
                     with st.spinner("Sending test email..."):
                         try:
-                            import smtplib
-                            from email.mime.text import MIMEText
-                            from email.mime.multipart import MIMEMultipart
-                            
-                            smtp_username = os.getenv('SMTP_USERNAME')
-                            smtp_password = os.getenv('CEO_AGENT_EMAIL_PASSWORD')
+                            smtp_username = env.get('SMTP_USERNAME')
+                            smtp_password = env.get('CEO_AGENT_EMAIL_PASSWORD')
                             
                             if not smtp_username or not smtp_password:
                                 st.error("❌ Email credentials not configured")
                             else:
-                                msg = MIMEMultipart()
-                                msg['From'] = smtp_username
-                                msg['To'] = test_email
-                                msg['Subject'] = "Test Email - Follow-up & Reminder Team"
-                                
-                                body = """
-                                <html>
-                                <body>
-                                    <h2>✅ Test Email Successful!</h2>
-                                    <p>This is a test email from your Follow-up & Reminder Team system.</p>
-                                    <p>If you received this email, your email configuration is working correctly.</p>
-                                    <hr>
-                                    <p style="color: #666; font-size: 12px;">© 2026 Koenig Solutions</p>
-                                </body>
-                                </html>
-                                """
-                                
-                                msg.attach(MIMEText(body, 'html'))
-                                
-                                with smtplib.SMTP(smtp_server, int(smtp_port)) as server:
-                                    server.starttls()
-                                    server.login(smtp_username, smtp_password)
-                                    server.sendmail(smtp_username, test_email, msg.as_string())
+                                _send_test_email(smtp_server, int(smtp_port), smtp_username, smtp_password, test_email)
                                 
                                 st.success(f"✅ Test email sent successfully to {test_email}")
                                 st.balloons()
@@ -109,21 +227,21 @@ def render_settings():
     with tab2:
         st.subheader("👥 Team Directory Management")
         
-        team_file = BASE_DIR / "data" / "Team_Directory.xlsx"
+        fs = _fs_snapshot()
         
-        if team_file.exists():
+        if fs["team"] is not None:
             try:
-                df = pd.read_excel(team_file)
+                df = _load_xlsx(str(TEAM_FILE), fs["team"])
                 
                 # Summary stats
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
                     st.metric("Total Users", len(df))
                 with col2:
-                    active_users = len(df[df['is_active'] == True]) if 'is_active' in df.columns else len(df)
+                    active_users = int((df['is_active'] == True).sum()) if 'is_active' in df.columns else len(df)
                     st.metric("Active Users", active_users)
                 with col3:
-                    admins = len(df[df['role'] == 'admin']) if 'role' in df.columns else 0
+                    admins = int((df['role'] == 'admin').sum()) if 'role' in df.columns else 0
                     st.metric("Admins", admins)
                 with col4:
                     departments = df['department'].nunique() if 'department' in df.columns else 0
@@ -174,7 +292,7 @@ def render_settings():
                 st.error(f"❌ Error loading team directory: {e}")
         else:
             st.warning("⚠️ Team Directory file not found")
-            st.info(f"Expected location: {team_file}")
+            st.info(f"Expected location: {TEAM_FILE}")
     
     # =====================================
     # TAB 3: REMINDER RULES
@@ -237,18 +355,16 @@ def render_settings():
         # Cron job status
         st.markdown("### ⚙️ Automation Status")
         
-        import subprocess
-        try:
-            result = subprocess.run(['crontab', '-l'], capture_output=True, text=True)
-            if 'run_reminders.py' in result.stdout:
-                st.success("✅ Automated reminders are configured (cron job active)")
-                with st.expander("View cron configuration"):
-                    st.code(result.stdout, language='bash')
-            else:
-                st.warning("⚠️ No automated reminders configured")
-                st.info("💡 Set up a cron job to run `python3 run_reminders.py` daily")
-        except Exception as e:
+        crontab = _crontab_text()
+        if crontab is None:
             st.info("ℹ️ Could not check cron status")
+        elif 'run_reminders.py' in crontab:
+            st.success("✅ Automated reminders are configured (cron job active)")
+            with st.expander("View cron configuration"):
+                st.code(crontab, language='bash')
+        else:
+            st.warning("⚠️ No automated reminders configured")
+            st.info("💡 Set up a cron job to run `python3 run_reminders.py` daily")
     
     # =====================================
     # TAB 4: SYSTEM INFO
@@ -262,14 +378,15 @@ def render_settings():
         with col1:
             st.markdown("### 📂 Data Files")
             
-            registry_file = BASE_DIR / "data" / "tasks_registry.xlsx"
-            team_file = BASE_DIR / "data" / "Team_Directory.xlsx"
+            fs = _fs_snapshot()
             
-            if registry_file.exists():
-                df = pd.read_excel(registry_file)
+            if fs["registry"] is not None:
+                df = _load_registry(str(REGISTRY_FILE), fs["registry"])
+                # One upper-casing pass and one count for every status
+                status_counts = df['Status'].str.upper().value_counts()
                 st.metric("Tasks in Registry", len(df))
-                st.metric("OPEN Tasks", len(df[df['Status'].str.upper() == 'OPEN']))
-                st.metric("COMPLETED Tasks", len(df[df['Status'].str.upper() == 'COMPLETED']))
+                st.metric("OPEN Tasks", int(status_counts.get('OPEN', 0)))
+                st.metric("COMPLETED Tasks", int(status_counts.get('COMPLETED', 0)))
             else:
                 st.error("❌ Tasks registry not found")
             
@@ -277,9 +394,9 @@ def render_settings():
             
             st.markdown("### 📍 File Locations")
             st.code(f"""
-Registry: {registry_file}
-Team Dir: {team_file}
-Logs: {BASE_DIR / 'logs'}
+Registry: {REGISTRY_FILE}
+Team Dir: {TEAM_FILE}
+Logs: {LOGS_DIR}
             """)
         
         with col2:
@@ -312,26 +429,25 @@ smtplib (built-in)
         health_checks = []
         
         # Check registry file
-        if registry_file.exists():
+        if fs["registry"] is not None:
             health_checks.append(("✅", "Tasks Registry", "File exists and readable"))
         else:
             health_checks.append(("❌", "Tasks Registry", "File not found"))
         
         # Check team directory
-        if team_file.exists():
+        if fs["team"] is not None:
             health_checks.append(("✅", "Team Directory", "File exists and readable"))
         else:
             health_checks.append(("❌", "Team Directory", "File not found"))
         
         # Check email config
-        if os.getenv('SMTP_USERNAME') and os.getenv('CEO_AGENT_EMAIL_PASSWORD'):
+        if env.get('SMTP_USERNAME') and env.get('CEO_AGENT_EMAIL_PASSWORD'):
             health_checks.append(("✅", "Email Config", "Credentials configured"))
         else:
             health_checks.append(("❌", "Email Config", "Credentials missing"))
         
         # Check logs directory
-        logs_dir = BASE_DIR / "logs"
-        if logs_dir.exists():
+        if fs["logs"] is not None:
             health_checks.append(("✅", "Logs Directory", "Directory exists"))
         else:
             health_checks.append(("⚠️", "Logs Directory", "Directory not found"))
@@ -1,12 +1,76 @@
 # -*- coding: utf-8 -*-
 
+import functools
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 
-from utils.task_normalizer import normalize_df
+from utils.excel_handler import pyarrow
+from utils.task_normalizer import normalize_df, PRIORITY_CATEGORIES
 from priority_manager import get_priority_emoji
 
+# Free-text columns are converted once after load to a string dtype (Arrow-backed
+# when pyarrow is installed), so strip/compare run column-wise instead of per object
+TEXT_COLUMNS = ['subject', 'owner', 'remarks', 'cc']
+TEXT_DTYPE = "string[pyarrow]" if pyarrow is not None else "string"
+
+# Edit-form priority choices and their selectbox positions
+PRIORITY_INDEX = {p: i for i, p in enumerate(PRIORITY_CATEGORIES)}
+
+
+# Common header variations, applied after lowercasing
+COLUMN_MAP = {
+    'task_text': 'subject',
+    'task': 'subject',
+    'due date': 'due_date',
+    'deadline': 'due_date',
+    'last reminder date': 'last_reminder_date'
+}
+
+# Columns this view needs, with the value used when the sheet lacks one
+REQUIRED_DEFAULTS = {
+    'subject': '',
+    'owner': '',
+    'status': 'OPEN',
+    'priority': 'MEDIUM',
+    'due_date': None,
+    'remarks': '',
+    'cc': '',
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _column_plan(columns):
+    """
+    For a raw header tuple: positions of the columns to keep, their view names,
+    and the required columns still missing. The handler's header rarely changes,
+    so reruns reuse the plan instead of redoing the string work
+    """
+    keep, names = [], []
+    for pos, col in enumerate(columns):
+        name = str(col).strip().lower()
+        name = COLUMN_MAP.get(name, name)
+        # First occurrence wins, including clashes created by lowercasing/mapping
+        if name not in names:
+            keep.append(pos)
+            names.append(name)
+    missing = [col for col in REQUIRED_DEFAULTS if col not in names]
+    return tuple(keep), tuple(names), tuple(missing)
+
+
+def _upper_distinct(col, default):
+    """
+    Strip/upper-case a status or priority column through its few distinct values
+    rather than every cell. Values are kept as written, unknown ones included; the
+    result is categorical over the values present, so filters compare codes
+    """
+    codes, uniques = pd.factorize(col.astype(object))
+    keys = pd.Index(uniques, dtype=object).astype(str).str.strip().str.upper()
+    # Missing cells (code -1) take the trailing default
+    values = np.append(keys.to_numpy(dtype=object), default)[codes]
+    return pd.Categorical(values, categories=list(dict.fromkeys([*keys, default])))
+
 
 def render_view_followups(excel_handler, user_manager):
     st.subheader("📥 View Follow-ups")
@@ -18,44 +82,39 @@ def render_view_followups(excel_handler, user_manager):
         st.info("No tasks available.")
         return
 
-    # ✅ CRITICAL FIX: Remove duplicate columns FIRST
-    df_raw = df_raw.loc[:, ~df_raw.columns.duplicated(keep='first')]
-    
-    # ✅ Normalize column names to lowercase for consistency
-    df_raw.columns = df_raw.columns.str.strip().str.lower()
-    
-    # ✅ Map common column variations
-    column_map = {
-        'task_text': 'subject',
-        'task': 'subject',
-        'due date': 'due_date',
-        'deadline': 'due_date',
-        'last reminder date': 'last_reminder_date'
-    }
+    # ✅ Lowercase/map headers, drop duplicate columns and add missing required
+    # ones in one select + assign, following the plan cached for this header
+    keep, names, missing = _column_plan(tuple(df_raw.columns))
+    df_raw = df_raw.iloc[:, list(keep)].set_axis(list(names), axis=1)
+    if missing:
+        df_raw = df_raw.assign(**{col: REQUIRED_DEFAULTS[col] for col in missing})
     
-    df_raw = df_raw.rename(columns=column_map)
+    # ✅ Normalize status/priority values once, over their distinct values
+    df_raw['status'] = _upper_distinct(df_raw['status'], 'OPEN')
+    df_raw['priority'] = _upper_distinct(df_raw['priority'], 'MEDIUM')
     
-    # ✅ Ensure required columns exist
-    required_cols = ['subject', 'owner', 'status', 'priority', 'due_date', 'remarks', 'cc']
-    for col in required_cols:
-        if col not in df_raw.columns:
-            df_raw[col] = '' if col in ['subject', 'owner', 'remarks', 'cc'] else 'OPEN' if col == 'status' else 'MEDIUM' if col == 'priority' else None
+    # ✅ Text columns typed and stripped once; missing cells stay <NA>
+    for col in TEXT_COLUMNS:
+        df_raw[col] = df_raw[col].astype(TEXT_DTYPE).str.strip()
     
-    # ✅ Normalize status values
-    df_raw['status'] = df_raw['status'].fillna('OPEN').astype(str).str.strip().str.upper()
+    # ✅ Keep due_date as datetime64 and count whole days to it once; the Due
+    # filters and labels compare these numbers (NaN for no date matches none)
+    df_raw['due_date'] = pd.to_datetime(df_raw['due_date'], errors='coerce').dt.normalize()
     
-    # ✅ Filter out deleted tasks
-    df = df_raw[df_raw['status'] != 'DELETED'].copy()
+    today = date.today()
+    due_days = df_raw['due_date'].to_numpy(dtype='datetime64[D]')
+    df_raw['days_left'] = np.where(
+        np.isnat(due_days), np.nan, (due_days - np.datetime64(today, 'D')).astype(np.int64)
+    )
+
+    # ✅ Deleted tasks are left out by the same mask the filters narrow, so the
+    # frame is only indexed once, at the end
+    mask = (df_raw['status'] != 'DELETED').to_numpy(copy=True)
     
-    if df.empty:
+    if not mask.any():
         st.info("No active tasks available.")
         return
 
-    # ✅ Convert due_date to date objects
-    df['due_date'] = pd.to_datetime(df['due_date'], errors='coerce').dt.date
-    
-    today = date.today()
-
     # --------------------------------------------------
     # FILTERS
     # --------------------------------------------------
@@ -64,7 +123,10 @@ def render_view_followups(excel_handler, user_manager):
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        owners = sorted([str(o) for o in df['owner'].dropna().unique() if str(o).strip() and str(o) != 'nan'])
+        # Owners are already stripped; drop blank and 'nan' ghost entries
+        owner_names = pd.Series(df_raw.loc[mask, 'owner'].dropna().unique(), dtype=TEXT_DTYPE)
+        owners = sorted(owner_names[(owner_names != '') & (owner_names != 'nan')])
+        owner_index = {o: i for i, o in enumerate(owners)}
         owner_filter = st.selectbox("Owner", ["ALL"] + owners)
 
     with col2:
@@ -79,23 +141,24 @@ def render_view_followups(excel_handler, user_manager):
     # --------------------------------------------------
     # APPLY FILTERS
     # --------------------------------------------------
-    filtered_df = df.copy()
-
     if owner_filter != "ALL":
-        filtered_df = filtered_df[filtered_df["owner"].astype(str).str.strip() == owner_filter]
+        mask &= df_raw["owner"].eq(owner_filter).fillna(False).to_numpy(dtype=bool)
 
     if status_filter != "ALL":
-        filtered_df = filtered_df[filtered_df["status"].astype(str).str.upper() == status_filter]
+        mask &= (df_raw["status"] == status_filter).to_numpy()
 
     if priority_filter != "ALL":
-        filtered_df = filtered_df[filtered_df["priority"].astype(str).str.upper() == priority_filter]
+        mask &= (df_raw["priority"] == priority_filter).to_numpy()
 
+    days_left = df_raw["days_left"].to_numpy()
     if due_filter == "Overdue":
-        filtered_df = filtered_df[filtered_df["due_date"] < today]
+        mask &= days_left < 0
     elif due_filter == "Today":
-        filtered_df = filtered_df[filtered_df["due_date"] == today]
+        mask &= days_left == 0
     elif due_filter == "Upcoming":
-        filtered_df = filtered_df[filtered_df["due_date"] > today]
+        mask &= days_left > 0
+
+    filtered_df = df_raw[mask]
 
     # --------------------------------------------------
     # RENDER TASKS
@@ -106,29 +169,88 @@ def render_view_followups(excel_handler, user_manager):
         st.info("No tasks match the selected filters.")
         return
 
-    # ✅ CRITICAL: Iterate using iterrows() and extract SCALAR values
-    for idx, row in filtered_df.iterrows():
-        
-        # ✅ Extract scalar values properly (NOT Series objects)
-        subject = str(row["subject"]) if pd.notna(row["subject"]) else "No subject"
-        owner = str(row["owner"]) if pd.notna(row["owner"]) else "Unknown"
-        priority = str(row["priority"]).upper() if pd.notna(row["priority"]) else "MEDIUM"
-        status = str(row["status"]).upper() if pd.notna(row["status"]) else "OPEN"
-        due_date = row["due_date"]
-        remarks = str(row["remarks"]) if pd.notna(row["remarks"]) else ""
-        
-        # Clean up values
-        subject = subject.strip()
-        owner = owner.strip()
-        priority = priority.strip()
-        status = status.strip()
-        remarks = remarks.strip()
-
-        priority_emoji = get_priority_emoji(priority)
-
-        # ---------- TASK CARD ----------
-        st.markdown(
-            f"""
+    # Defaults for missing cells filled once, so no per-cell notna checks are needed
+    cards_df = filtered_df.fillna({
+        "subject": "No subject",
+        "owner": "Unknown",
+        "priority": "MEDIUM",
+        "status": "OPEN",
+        "remarks": ""
+    })
+
+    # Display values for every task, built column-wise instead of per row; text,
+    # status and priority were already cleaned once after load
+    tasks = pd.DataFrame({
+        "subject": cards_df["subject"],
+        "owner": cards_df["owner"],
+        "priority": cards_df["priority"].astype(str),
+        "status": cards_df["status"].astype(str),
+        "due_date": cards_df["due_date"].dt.date,
+        "remarks": cards_df["remarks"],
+    })
+    days = cards_df["days_left"]
+    due_label = pd.Series("", index=tasks.index, dtype=object)
+    due_label[days < 0] = "⚠️ Overdue by " + days[days < 0].abs().astype(int).astype(str) + " day(s)"
+    due_label[days == 0] = "⏳ Due TODAY"
+    due_label[days > 0] = "✅ Due in " + days[days > 0].astype(int).astype(str) + " day(s)"
+
+    # ---------- TASK TABLE ----------
+    # One table widget for all tasks; the card and its actions render only for
+    # the selected task, instead of markdown, buttons and an expander per row
+    table = pd.DataFrame({
+        "Subject": tasks["subject"],
+        "Owner": tasks["owner"],
+        "Priority": cards_df["priority"].map(get_priority_emoji).astype(str) + " " + tasks["priority"],
+        "Due Date": tasks["due_date"].map(lambda d: d if pd.notna(d) else "N/A"),
+        "Status": tasks["status"],
+        "Due": due_label,
+        "Remarks": tasks["remarks"],
+    })
+
+    try:
+        event = st.dataframe(
+            table,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="followups_table",
+        )
+        selected_rows = event.selection.rows
+        position = selected_rows[0] if selected_rows else None
+    except TypeError:
+        # Streamlit before 1.35 has no row selection; pick the task from a list instead
+        st.dataframe(table, use_container_width=True, hide_index=True)
+        labels = (tasks["subject"] + " — " + tasks["owner"]).tolist()
+        position = st.selectbox(
+            "Select a task to update",
+            range(len(labels)),
+            format_func=lambda i: labels[i],
+            index=None,
+        )
+
+    if position is None or position >= len(tasks):
+        st.caption("Select a task in the table to update or delete it.")
+        return
+
+    idx = tasks.index[position]
+    _render_task_card(excel_handler, idx, tasks.loc[idx], due_label.loc[idx], owners, owner_index, today)
+
+
+def _render_task_card(excel_handler, idx, task, due_text, owners, owner_index, today):
+    """Card, status toggle and edit/delete controls for the selected task"""
+    subject = task["subject"]
+    owner = task["owner"]
+    priority = task["priority"]
+    status = task["status"]
+    due_date = task["due_date"]
+    remarks = task["remarks"]
+
+    priority_emoji = get_priority_emoji(priority)
+
+    # ---------- TASK CARD ----------
+    st.markdown(
+        f"""
 **📝 {subject}**  
 👤 Owner: **{owner}**  
 🎯 Priority: {priority_emoji} {priority}  
@@ -136,112 +258,115 @@ def render_view_followups(excel_handler, user_manager):
 🏷 Status: **{status}**  
 📝 Remarks: {remarks if remarks else "None"}
 """
-        )
+    )
 
-        # ---------- STATUS TOGGLE ----------
-        col_status1, col_status2 = st.columns(2)
-        
-        with col_status1:
-            if status == "OPEN":
-                if st.button("✅ Mark Completed", key=f"complete_{idx}"):
-                    # ✅ Update using ExcelHandler with Title Case columns
-                    excel_handler.update_row(idx, {
-                        "Status": "DONE",
-                        "Completed Date": str(today),
-                        "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
+    # ---------- STATUS TOGGLE ----------
+    col_status1, col_status2 = st.columns(2)
+    
+    with col_status1:
+        if status == "OPEN":
+            if st.button("✅ Mark Completed", key=f"complete_{idx}"):
+                # ✅ Update using ExcelHandler with Title Case columns
+                if excel_handler.update_row(idx, {
+                    "Status": "DONE",
+                    "Completed Date": str(today),
+                    "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }):
                     st.success("✅ Task marked as completed!")
                     st.rerun()
-
-        with col_status2:
-            if status == "DONE":
-                if st.button("🔁 Re-open", key=f"reopen_{idx}"):
-                    excel_handler.update_row(idx, {
-                        "Status": "OPEN",
-                        "Completed Date": "",
-                        "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
+                else:
+                    st.error("❌ Could not save the change. Please try again.")
+
+    with col_status2:
+        if status == "DONE":
+            if st.button("🔁 Re-open", key=f"reopen_{idx}"):
+                if excel_handler.update_row(idx, {
+                    "Status": "OPEN",
+                    "Completed Date": "",
+                    "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }):
                     st.success("🔁 Task re-opened!")
                     st.rerun()
+                else:
+                    st.error("❌ Could not save the change. Please try again.")
+
+    # ---------- EDIT / DELETE ----------
+    with st.expander("✏️ Edit / Delete Task"):
+
+        # Owner dropdown
+        new_owner = st.selectbox(
+            "Owner",
+            owners,
+            index=owner_index.get(owner, 0),
+            key=f"owner_{idx}",
+        )
 
-        # ---------- EDIT / DELETE ----------
-        with st.expander("✏️ Edit / Delete Task"):
-
-            # Owner dropdown
-            new_owner = st.selectbox(
-                "Owner",
-                owners,
-                index=owners.index(owner) if owner in owners else 0,
-                key=f"owner_{idx}",
-            )
-
-            # Due Date
-            if pd.isna(due_date):
-                safe_due = today
-            else:
-                safe_due = due_date
-
-            new_due_date = st.date_input(
-                "Due Date",
-                value=safe_due,
-                key=f"due_{idx}",
-            )
-
-            # Priority
-            priorities = ["URGENT", "HIGH", "MEDIUM", "LOW"]
-            new_priority = st.selectbox(
-                "Priority",
-                priorities,
-                index=priorities.index(priority) if priority in priorities else 2,
-                key=f"prio_{idx}",
-            )
-
-            # Remarks
-            new_remarks = st.text_area(
-                "Remarks",
-                value=remarks,
-                key=f"remarks_{idx}",
-            )
-
-            # Save Changes
-            col_edit1, col_edit2 = st.columns(2)
-            
-            with col_edit1:
-                if st.button("💾 Save Changes", key=f"save_{idx}", type="primary"):
-                    excel_handler.update_row(idx, {
-                        "Owner": new_owner,
-                        "Due Date": str(new_due_date),
-                        "Priority": new_priority,
-                        "Remarks": new_remarks,
-                        "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
+        # Due Date
+        if pd.isna(due_date):
+            safe_due = today
+        else:
+            safe_due = due_date
+
+        new_due_date = st.date_input(
+            "Due Date",
+            value=safe_due,
+            key=f"due_{idx}",
+        )
+
+        # Priority
+        new_priority = st.selectbox(
+            "Priority",
+            PRIORITY_CATEGORIES,
+            index=PRIORITY_INDEX.get(priority, PRIORITY_INDEX["MEDIUM"]),
+            key=f"prio_{idx}",
+        )
+
+        # Remarks
+        new_remarks = st.text_area(
+            "Remarks",
+            value=remarks,
+            key=f"remarks_{idx}",
+        )
+
+        # Save Changes
+        col_edit1, col_edit2 = st.columns(2)
+        
+        with col_edit1:
+            if st.button("💾 Save Changes", key=f"save_{idx}", type="primary"):
+                if excel_handler.update_row(idx, {
+                    "Owner": new_owner,
+                    "Due Date": str(new_due_date),
+                    "Priority": new_priority,
+                    "Remarks": new_remarks,
+                    "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }):
                     st.success("💾 Changes saved!")
                     st.rerun()
-
-            # ✅ DELETE BUTTON - FIXED
-            with col_edit2:
-                if st.button("🗑️ Delete Task", key=f"delete_{idx}", type="secondary"):
-                    # ✅ CRITICAL FIX: Use Title Case "Status" to match Excel schema
-                    try:
-                        excel_handler.update_row(idx, {
-                            "Status": "DELETED",
-                            "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        })
+                else:
+                    st.error("❌ Could not save the changes. Please try again.")
+
+        # ✅ DELETE BUTTON - FIXED
+        with col_edit2:
+            if st.button("🗑️ Delete Task", key=f"delete_{idx}", type="secondary"):
+                # ✅ CRITICAL FIX: Use Title Case "Status" to match Excel schema
+                try:
+                    if excel_handler.update_row(idx, {
+                        "Status": "DELETED",
+                        "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    }):
                         st.warning("🗑️ Task deleted successfully!")
                         st.rerun()
-                    except Exception as e:
-                        st.error(f"❌ Error deleting task: {e}")
-                        st.write(f"Debug - Row index: {idx}")
-                        st.write(f"Debug - Available columns: {list(excel_handler.load_data().columns)}")
-
-        # ---------- DUE STATUS INDICATOR ----------
-        if isinstance(due_date, date):
-            days = (due_date - today).days
-            if days < 0:
-                st.error(f"⚠️ Overdue by {abs(days)} day(s)")
-            elif days == 0:
-                st.warning("⏳ Due TODAY")
-            else:
-                st.success(f"✅ Due in {days} day(s)")
-
-        st.divider()
+                    else:
+                        st.error("❌ Could not delete the task. Please try again.")
+                except Exception as e:
+                    st.error(f"❌ Error deleting task: {e}")
+                    st.write(f"Debug - Row index: {idx}")
+                    st.write(f"Debug - Available columns: {excel_handler.required_columns}")
+
+    # ---------- DUE STATUS INDICATOR ----------
+    if due_text.startswith("⚠️"):
+        st.error(due_text)
+    elif due_text.startswith("⏳"):
+        st.warning(due_text)
+    elif due_text:
+        st.success(due_text)